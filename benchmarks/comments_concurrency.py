@@ -0,0 +1,130 @@
+"""Одновременное добавление комментариев из нескольких процессов.
+
+Каждый процесс логинится своим пользователем и отправляет комментарии
+к одной и той же публикации через CommentCreateView. Прогон выполняется
+на отдельной файловой базе SQLite дважды: без настроек SQLITE_PRAGMAS и с
+ними.
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.comments_concurrency --processes 8 --comments 100
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import statistics
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from benchmarks import setup_django
+
+
+def init_worker(db_path, tuned):
+    os.environ['BLOGICUM_DB_PATH'] = db_path
+    setup_django()
+    if not tuned:
+        from django.conf import settings
+        settings.SQLITE_PRAGMAS = {}
+
+
+def prepare(processes):
+    from django.contrib.auth import get_user_model
+    from django.core.management import call_command
+    from django.utils import timezone
+
+    from blog.models import Category, Post
+
+    call_command('migrate', verbosity=0)
+    User = get_user_model()
+    author = User.objects.create(username='author')
+    category = Category.objects.create(
+        title='Категория', slug='category', description='Описание')
+    post = Post.objects.create(
+        title='Публикация',
+        text='Текст публикации.',
+        pub_date=timezone.now(),
+        author=author,
+        category=category,
+    )
+    for number in range(processes):
+        User.objects.create(username=f'commenter{number}')
+    return post.pk
+
+
+def post_comments(post_id, number, comments):
+    from django.contrib.auth import get_user_model
+    from django.db import OperationalError
+    from django.test import Client
+
+    # Адрес вне INTERNAL_IPS, чтобы в dev-настройках не рендерилась
+    # отладочная панель.
+    client = Client(SERVER_NAME='localhost', REMOTE_ADDR='10.0.0.1')
+    client.force_login(
+        get_user_model().objects.get(username=f'commenter{number}'))
+    url = f'/posts/{post_id}/comment/'
+    timings = []
+    errors = 0
+    for index in range(comments):
+        started_at = time.perf_counter()
+        try:
+            response = client.post(url, {'text': f'Комментарий {index}'})
+        except OperationalError:
+            errors += 1
+            continue
+        timings.append(time.perf_counter() - started_at)
+        if response.status_code != 302:
+            errors += 1
+    return timings, errors
+
+
+def run(tuned, args):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = str(Path(tmp_dir) / 'db.sqlite3')
+        with ProcessPoolExecutor(
+                max_workers=args.processes,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=init_worker,
+                initargs=(db_path, tuned)) as pool:
+            post_id = pool.submit(prepare, args.processes).result()
+            started_at = time.perf_counter()
+            results = list(pool.map(
+                post_comments,
+                [post_id] * args.processes,
+                range(args.processes),
+                [args.comments] * args.processes))
+            elapsed = time.perf_counter() - started_at
+    timings = sorted(
+        t for worker_timings, _ in results for t in worker_timings)
+    errors = sum(worker_errors for _, worker_errors in results)
+    report = {
+        'requests': args.processes * args.comments,
+        'errors': errors,
+        'requests_per_second': len(timings) / elapsed,
+    }
+    if timings:
+        report.update({
+            'p50_ms': statistics.median(timings) * 1000,
+            'p99_ms': timings[int(len(timings) * 0.99)] * 1000,
+            'max_ms': timings[-1] * 1000,
+        })
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--processes', type=int, default=os.cpu_count())
+    parser.add_argument('--comments', type=int, default=100)
+    args = parser.parse_args()
+
+    report = {
+        'default': run(False, args),
+        'tuned': run(True, args),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""Время рендеринга ленты с обычными и с кэширующими загрузчиками шаблонов.
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.templates --iterations 200
+"""
+import argparse
+import json
+import statistics
+import time
+from copy import deepcopy
+
+from benchmarks import setup_django
+
+CACHED_LOADERS = [
+    ('django.template.loaders.cached.Loader', [
+        'django.template.loaders.filesystem.Loader',
+        'django.template.loaders.app_directories.Loader',
+    ]),
+]
+
+
+def make_engine(cached):
+    from django.conf import settings
+    from django.template.backends.django import DjangoTemplates
+
+    params = deepcopy(settings.TEMPLATES[0])
+    params.pop('BACKEND')
+    params['NAME'] = 'cached' if cached else 'uncached'
+    params['APP_DIRS'] = False
+    params['OPTIONS']['debug'] = False
+    params['OPTIONS']['loaders'] = (
+        CACHED_LOADERS if cached else CACHED_LOADERS[0][1])
+    return DjangoTemplates(params)
+
+
+def make_context(posts_at_page):
+    from django.contrib.auth import get_user_model
+    from django.contrib.auth.models import AnonymousUser
+    from django.core.paginator import Paginator
+    from django.test import RequestFactory
+    from django.urls import resolve
+    from django.utils import timezone
+
+    from blog.models import Category, Location, Post
+
+    User = get_user_model()
+    author = User(id=1, username='author')
+    category = Category(id=1, slug='category', title='Категория')
+    location = Location(id=1, name='Место')
+    posts = [
+        Post(
+            id=i,
+            title=f'Публикация {i}',
+            text='Текст публикации. ' * 50,
+            pub_date=timezone.now(),
+            author=author,
+            category=category,
+            location=location,
+            comment_count=i,
+        )
+        for i in range(1, posts_at_page + 1)
+    ]
+    request = RequestFactory().get('/')
+    request.user = AnonymousUser()
+    request.resolver_match = resolve('/')
+    page_obj = Paginator(posts, posts_at_page).page(1)
+    return {'page_obj': page_obj}, request
+
+
+def measure(engine, context, request, iterations):
+    timings = []
+    for _ in range(iterations):
+        started_at = time.perf_counter()
+        engine.get_template('blog/index.html').render(context, request)
+        timings.append(time.perf_counter() - started_at)
+    return {
+        'mean_ms': statistics.mean(timings) * 1000,
+        'p50_ms': statistics.median(timings) * 1000,
+        'max_ms': max(timings) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--posts', type=int, default=10)
+    args = parser.parse_args()
+    setup_django()
+
+    context, request = make_context(args.posts)
+    report = {}
+    for name, cached in (('uncached', False), ('cached', True)):
+        engine = make_engine(cached)
+        engine.get_template('blog/index.html').render(context, request)
+        report[name] = measure(engine, context, request, args.iterations)
+    report['speedup'] = (
+        report['uncached']['mean_ms'] / report['cached']['mean_ms'])
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
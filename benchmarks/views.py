@@ -0,0 +1,183 @@
+"""Задержка и число SQL-запросов основных страниц блога на большой базе.
+
+Создаёт временную базу SQLite, наполняет её командой seed_blog (категории
+и местоположения из db.json) и прогоняет сценарии через тестовый клиент
+Django. Время и число запросов берутся из
+InstrumentationMiddleware. Отчёт в JSON удобно сравнивать между коммитами.
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.views --output report.json
+    python -m benchmarks.views --scale 0.01 --iterations 50
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks import PROJECT_DIR, setup_django
+
+DB_JSON = PROJECT_DIR.parent / 'db.json'
+
+SCENARIOS = (
+    'index',
+    'category',
+    'profile',
+    'detail',
+    'comment_create',
+    'post_create',
+)
+
+
+def get_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'],
+            capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def percentile(values, percent):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * percent / 100))]
+
+
+def load_targets():
+    from django.db.models import Count
+    from django.utils import timezone
+
+    from blog.models import Category, Post
+
+    published = Post.objects.filter(
+        is_published=True,
+        pub_date__lt=timezone.now(),
+        category__is_published=True)
+    return {
+        'category_slugs': list(Category.objects.filter(
+            is_published=True).values_list('slug', flat=True)),
+        'post_ids': list(published.values_list('pk', flat=True)[:1000]),
+        'authors': list(published.values(
+            'author__username').annotate(n=Count('pk')).order_by(
+            '-n').values_list('author__username', flat=True)[:100]),
+        'category_ids': list(Category.objects.filter(
+            is_published=True).values_list('pk', flat=True)),
+    }
+
+
+def make_request(scenario, client, rng, targets):
+    if scenario == 'index':
+        return client.get('/', {'page': rng.randint(1, 5)})
+    if scenario == 'category':
+        slug = rng.choice(targets['category_slugs'])
+        return client.get(f'/category/{slug}/')
+    if scenario == 'profile':
+        return client.get(f'/profile/{rng.choice(targets["authors"])}/')
+    if scenario == 'detail':
+        return client.get(f'/posts/{rng.choice(targets["post_ids"])}/')
+    if scenario == 'comment_create':
+        post_id = rng.choice(targets['post_ids'])
+        return client.post(
+            f'/posts/{post_id}/comment/', {'text': 'Комментарий'})
+    return client.post('/posts/create/', {
+        'title': 'Заголовок',
+        'text': 'Текст публикации',
+        'pub_date': '2020-01-01 00:00',
+        'category': rng.choice(targets['category_ids']),
+    })
+
+
+def measure(scenario, client, targets, iterations, warmup, rng):
+    timings = []
+    queries = []
+    for number in range(warmup + iterations):
+        response = make_request(scenario, client, rng, targets)
+        if response.status_code not in (200, 302):
+            raise RuntimeError(
+                f'{scenario}: неожиданный ответ {response.status_code}')
+        if number < warmup:
+            continue
+        metrics = response.wsgi_request.metrics
+        timings.append(metrics.total_time * 1000)
+        queries.append(metrics.queries)
+    return {
+        'requests': iterations,
+        'p50_ms': percentile(timings, 50),
+        'p99_ms': percentile(timings, 99),
+        'mean_ms': statistics.mean(timings),
+        'queries_per_request': statistics.mean(queries),
+        'max_queries': max(queries),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=10_000)
+    parser.add_argument('--posts', type=int, default=100_000)
+    parser.add_argument('--comments', type=int, default=1_000_000)
+    parser.add_argument(
+        '--scale', type=float, default=1.0,
+        help='Множитель для числа пользователей, постов и комментариев.')
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--warmup', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--scenario', action='append', choices=SCENARIOS)
+    parser.add_argument('--output', type=Path)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.environ['BLOGICUM_DB_PATH'] = str(Path(tmp_dir) / 'db.sqlite3')
+        os.environ['BLOGICUM_METRICS_PATH'] = str(
+            Path(tmp_dir) / 'metrics.sqlite3')
+        setup_django()
+        from django.conf import settings
+        from django.contrib.auth import get_user_model
+        from django.core.management import call_command
+        from django.test import Client
+
+        settings.DEBUG = False
+        call_command('migrate', verbosity=0)
+        counts = {
+            'users': int(args.users * args.scale),
+            'posts': int(args.posts * args.scale),
+            'comments': int(args.comments * args.scale),
+        }
+        started_at = time.perf_counter()
+        call_command(
+            'seed_blog', **counts, seed=args.seed, fixture=str(DB_JSON),
+            verbosity=0)
+        seed_seconds = time.perf_counter() - started_at
+
+        targets = load_targets()
+        client = Client(SERVER_NAME='localhost')
+        client.force_login(get_user_model().objects.order_by('pk').first())
+        rng = random.Random(args.seed)
+        report = {
+            'commit': get_commit(),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'dataset': {**counts, 'seed_seconds': seed_seconds},
+            'scenarios': {
+                scenario: measure(
+                    scenario, client, targets,
+                    args.iterations, args.warmup, rng)
+                for scenario in args.scenario or SCENARIOS
+            },
+        }
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        args.output.write_text(output + '\n', encoding='utf-8')
+    print(output)
+
+
+if __name__ == '__main__':
+    main()
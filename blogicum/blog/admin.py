@@ -26,6 +26,11 @@ class PostAdmin(admin.ModelAdmin):
         'location'
     )
 
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        return queryset.matching(search_term), False
+
 
 admin.site.register(Category)
 admin.site.register(Location)
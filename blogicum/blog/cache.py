@@ -0,0 +1,78 @@
+import hashlib
+import time
+
+from django.core.cache import cache
+
+from core.metrics import record_cache
+
+KEY_PREFIX = 'blog'
+# Увеличить, если меняется формат закэшированных значений.
+KEY_SCHEMA_VERSION = 1
+
+
+def make_key(namespace, *parts):
+    return ':'.join(
+        [KEY_PREFIX, str(KEY_SCHEMA_VERSION), namespace, *map(str, parts)])
+
+
+def get_version(name):
+    key = make_key('version', name)
+    cache.add(key, time.time_ns(), None)
+    return cache.get(key)
+
+
+def bump_version(name):
+    cache.set(make_key('version', name), time.time_ns(), None)
+
+
+def versioned_key(namespace, *parts):
+    return make_key(namespace, get_version(namespace), *parts)
+
+
+def get_or_set(namespace, parts, default, timeout=None):
+    key = versioned_key(namespace, *parts)
+    value = cache.get(key)
+    record_cache(namespace, value is not None)
+    if value is None:
+        value = default()
+        cache.set(key, value, timeout)
+    return value
+
+
+def get_versions(names):
+    keys = {make_key('version', name): name for name in names}
+    versions = cache.get_many(keys)
+    missing = {key: time.time_ns() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, None)
+        versions.update(missing)
+    return {keys[key]: version for key, version in versions.items()}
+
+
+def set_card_versions(posts):
+    # cards — общая версия всех карточек для массовой загрузки, когда
+    # сбрасывать версию каждого поста по отдельности слишком долго.
+    names = {
+        post.pk: (
+            'cards',
+            f'post:{post.pk}',
+            f'category:{post.category_id}',
+            f'location:{post.location_id}',
+            f'user:{post.author_id}',
+        )
+        for post in posts
+    }
+    versions = get_versions(
+        {name for post_names in names.values() for name in post_names})
+    for post in posts:
+        post.card_version = '-'.join(
+            [str(versions[name]) for name in names[post.pk]]
+            + [str(post.comment_count)])
+
+
+def page_cache_key(path, groups):
+    versions = get_versions(['page:all', *groups])
+    return make_key(
+        'page',
+        *(versions[name] for name in ['page:all', *groups]),
+        hashlib.md5(path.encode()).hexdigest())
@@ -1,2 +1,59 @@
 CHAR_FIELD_LEN = 256
 POSTS_AT_PAGE = 10
+COMMENTS_AT_PAGE = 50
+# Сколько номеров страниц показывать по обе стороны от текущей.
+PAGINATOR_WINDOW = 5
+POST_COUNT_CACHE_TIMEOUT = 60 * 5
+POST_CARD_CACHE_TIMEOUT = 60 * 60 * 24
+PAGE_CACHE_TIMEOUT = 60 * 10
+# Уменьшенные копии картинок публикаций: имя -> наибольшие ширина и высота.
+IMAGE_RENDITIONS = {
+    'feed': (640, 640),
+    'detail': (1200, 1200),
+    'full': (2048, 2048),
+}
+RENDITION_QUALITY = 80
+# Не чаще раза в столько секунд ставить задачу на копии одной картинки.
+RENDITION_JOB_TIMEOUT = 60 * 10
+MAX_IMAGE_UPLOAD_SIZE = 10 * 1024 * 1024
+MAX_IMAGE_PIXELS = 40_000_000
+# Сколько первых байт загрузки копить для чтения заголовка картинки.
+IMAGE_HEADER_MAX_SIZE = 256 * 1024
+# Поля, которые нужны для карточки поста в ленте.
+FEED_POST_FIELDS = (
+    'title',
+    'text',
+    'pub_date',
+    'image',
+    'is_published',
+    'comment_count',
+    'author__username',
+    'category__title',
+    'category__slug',
+    'category__is_published',
+    'location__name',
+    'location__is_published',
+)
+# Поля автора, которые видны в карточке поста.
+AUTHOR_CARD_FIELDS = ('username', 'first_name', 'last_name')
+# Поля, которые нужны для списка комментариев на странице поста.
+COMMENT_LIST_FIELDS = (
+    'text',
+    'created_at',
+    'author__username',
+)
+# Поиск: сколько слов запроса учитывать и длина фрагмента в словах.
+SEARCH_MAX_WORDS = 10
+SEARCH_SNIPPET_WORDS = 24
+# Вес совпадений в заголовке и в тексте при ранжировании bm25.
+SEARCH_TITLE_WEIGHT = 10.0
+SEARCH_TEXT_WEIGHT = 1.0
+# Модели в выгрузке export_blog/import_blog в порядке зависимостей по FK.
+BLOG_DUMP_MODELS = (
+    'auth.user',
+    'blog.category',
+    'blog.location',
+    'blog.post',
+    'blog.comment',
+)
+BLOG_DUMP_BATCH_SIZE = 5000
@@ -1,7 +1,10 @@
 from django import forms
 from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.template.defaultfilters import filesizeformat
 
 from blog.models import Post, Comment
+import blog.constants as const
 
 User = get_user_model()
 
@@ -12,10 +15,47 @@ class ProfileForm(forms.ModelForm):
         fields = ('first_name', 'last_name', 'username', 'email')
 
 
+class PostImageField(forms.ImageField):
+    default_error_messages = {
+        'too_large': 'Размер картинки не должен превышать %(limit)s.',
+        'too_many_pixels': (
+            'Разрешение картинки не должно превышать %(limit)s пикселей.'),
+    }
+
+    def get_upload_error(self, data):
+        error = getattr(data, 'upload_error', None)
+        if error is None and getattr(data, 'size', 0) > (
+                const.MAX_IMAGE_UPLOAD_SIZE):
+            error = 'too_large'
+        return error
+
+    def raise_upload_error(self, error):
+        limits = {
+            'too_large': filesizeformat(const.MAX_IMAGE_UPLOAD_SIZE),
+            'too_many_pixels': const.MAX_IMAGE_PIXELS,
+        }
+        raise ValidationError(
+            self.error_messages[error],
+            code=error,
+            params={'limit': limits[error]})
+
+    def to_python(self, data):
+        error = self.get_upload_error(data)
+        if error:
+            self.raise_upload_error(error)
+        upload = super().to_python(data)
+        if upload is not None:
+            width, height = upload.image.size
+            if width * height > const.MAX_IMAGE_PIXELS:
+                self.raise_upload_error('too_many_pixels')
+        return upload
+
+
 class PostForm(forms.ModelForm):
     class Meta:
         model = Post
         exclude = ("author",)
+        field_classes = {'image': PostImageField}
 
 
 class CommentForm(forms.ModelForm):
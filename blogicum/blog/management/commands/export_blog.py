@@ -0,0 +1,62 @@
+import datetime
+import sys
+import time
+
+from django.apps import apps
+from django.core import serializers
+from django.core.management.base import BaseCommand
+from django.core.serializers.json import DjangoJSONEncoder
+
+import blog.constants as const
+
+
+class DumpJSONEncoder(DjangoJSONEncoder):
+    # DjangoJSONEncoder округляет время до миллисекунд, а выгрузка должна
+    # переносить даты без потерь.
+
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+class Command(BaseCommand):
+    help = ('Выгружает пользователей, категории, местоположения, публикации '
+            'и комментарии в JSON Lines: по одному объекту в строке.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'output', nargs='?', default='-',
+            help='Файл для выгрузки; по умолчанию stdout.')
+        parser.add_argument(
+            '--batch-size', type=int, default=const.BLOG_DUMP_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        if options['output'] == '-':
+            self.export(sys.stdout, options['batch_size'])
+            return
+        with open(options['output'], 'w', encoding='utf-8') as output:
+            self.export(output, options['batch_size'])
+
+    def export(self, output, batch_size):
+        for label in const.BLOG_DUMP_MODELS:
+            model = apps.get_model(label)
+            started_at = time.perf_counter()
+            # Связи многие-ко-многим (группы и права пользователей) не
+            # выгружаются: сериализатор запрашивал бы их для каждой строки.
+            fields = [
+                field.name for field in model._meta.local_fields
+                if not field.primary_key
+            ]
+            queryset = model._base_manager.order_by('pk')
+            serializers.serialize(
+                'jsonl',
+                queryset.iterator(chunk_size=batch_size),
+                fields=fields,
+                stream=output,
+                cls=DumpJSONEncoder)
+            count = queryset.count()
+            elapsed = time.perf_counter() - started_at
+            self.stderr.write(
+                f'{label}: {count} строк за {elapsed:.1f} с'
+                f' ({count / max(elapsed, 1e-6):.0f} строк/с)')
@@ -0,0 +1,113 @@
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from django.apps import apps
+from django.core import serializers
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from blog.models import Post
+from blog.signals import bulk_load_finished
+from core.bulk import insert_rows
+import blog.constants as const
+
+
+class Command(BaseCommand):
+    help = ('Загружает выгрузку export_blog в формате JSON Lines порциями, '
+            'не читая файл в память целиком.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('input', help='Файл JSON Lines.')
+        parser.add_argument(
+            '--batch-size', type=int, default=const.BLOG_DUMP_BATCH_SIZE)
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        self.using = options['database']
+        started_at = time.perf_counter()
+        total = 0
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # Строки раскладываются по файлам моделей, чтобы затем загрузить
+            # их в порядке зависимостей независимо от порядка в выгрузке.
+            spilled = self.spill(options['input'], Path(tmp_dir))
+            # Загрузка целиком в одной транзакции: при ошибке в середине
+            # база остаётся без частично загруженных данных.
+            with transaction.atomic(using=self.using):
+                for label in const.BLOG_DUMP_MODELS:
+                    if label in spilled:
+                        total += self.load(
+                            apps.get_model(label),
+                            spilled[label],
+                            options['batch_size'])
+                self.finish()
+            bulk_load_finished()
+        elapsed = time.perf_counter() - started_at
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено строк: {total} за {elapsed:.1f} с'
+            f' ({total / max(elapsed, 1e-6):.0f} строк/с)'))
+
+    def spill(self, path, tmp_dir):
+        files = {}
+        skipped = 0
+        try:
+            with open(path, encoding='utf-8') as source:
+                for number, line in enumerate(source, 1):
+                    if not line.strip():
+                        continue
+                    try:
+                        label = json.loads(line)['model'].lower()
+                    except (ValueError, KeyError, TypeError, AttributeError):
+                        raise CommandError(
+                            f'{path}:{number}: некорректная строка')
+                    if label not in const.BLOG_DUMP_MODELS:
+                        skipped += 1
+                        continue
+                    if label not in files:
+                        files[label] = open(
+                            tmp_dir / f'{label}.jsonl', 'w', encoding='utf-8')
+                    files[label].write(line.rstrip('\n') + '\n')
+        finally:
+            for spill_file in files.values():
+                spill_file.close()
+        if skipped:
+            self.stderr.write(f'Пропущено объектов других моделей: {skipped}')
+        return {label: tmp_dir / f'{label}.jsonl' for label in files}
+
+    def load(self, model, path, batch_size):
+        connection = connections[self.using]
+        fields = model._meta.concrete_fields
+        started_at = time.perf_counter()
+        with open(path, encoding='utf-8') as source:
+            rows = (
+                tuple(
+                    field.get_db_prep_save(
+                        getattr(obj.object, field.attname), connection)
+                    for field in fields)
+                for obj in serializers.deserialize(
+                    'jsonl', source, using=self.using)
+            )
+            count = insert_rows(
+                model, [field.name for field in fields], rows,
+                batch_size, using=self.using)
+        elapsed = time.perf_counter() - started_at
+        self.stdout.write(
+            f'{model._meta.label_lower}: {count} строк за {elapsed:.1f} с'
+            f' ({count / max(elapsed, 1e-6):.0f} строк/с)')
+        return count
+
+    def finish(self):
+        # Вставка идёт мимо save() и сигналов: счётчики комментариев и
+        # последовательности первичных ключей обновляются здесь, а кэш —
+        # после фиксации транзакции.
+        Post.objects.using(self.using).recount_comments()
+        connection = connections[self.using]
+        sequence_sql = connection.ops.sequence_reset_sql(
+            no_style(),
+            [apps.get_model(label) for label in const.BLOG_DUMP_MODELS])
+        if sequence_sql:
+            with connection.cursor() as cursor:
+                for sql in sequence_sql:
+                    cursor.execute(sql)
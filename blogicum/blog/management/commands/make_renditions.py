@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from PIL import Image
+
+from blog.models import Post
+from blog.renditions import generate_renditions
+
+
+class Command(BaseCommand):
+    help = 'Создаёт уменьшенные копии картинок публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Пересоздать уже существующие копии.')
+
+    def handle(self, *args, **options):
+        images = Post.objects.exclude(image='').values_list(
+            'image', flat=True)
+        processed = 0
+        for image_name in images.iterator():
+            try:
+                generate_renditions(image_name, force=options['force'])
+            except (OSError, Image.DecompressionBombError) as error:
+                self.stderr.write(f'{image_name}: {error}')
+                continue
+            processed += 1
+        self.stdout.write(
+            self.style.SUCCESS(f'Обработано картинок: {processed}'))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F
+
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает счётчики комментариев у публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Только показать публикации с расхождениями.')
+
+    def handle(self, *args, **options):
+        drifted = Post.objects.annotate(
+            actual=Count('comment')
+        ).exclude(comment_count=F('actual'))
+        if options['dry_run']:
+            for post_id, stored, actual in drifted.values_list(
+                    'pk', 'comment_count', 'actual'):
+                self.stdout.write(f'{post_id}: {stored} -> {actual}')
+            return
+        updated = Post.objects.filter(
+            pk__in=drifted.values('pk')).recount_comments()
+        self.stdout.write(
+            self.style.SUCCESS(f'Исправлено публикаций: {updated}'))
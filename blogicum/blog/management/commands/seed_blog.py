@@ -0,0 +1,231 @@
+import io
+import itertools
+import json
+import random
+import time
+from collections import Counter
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+from PIL import Image
+
+from blog.models import Category, Comment, Location, Post
+from blog.signals import bulk_load_finished
+from core.bulk import batched, insert_rows
+import blog.constants as const
+
+User = get_user_model()
+
+WORDS = (
+    'утро', 'день', 'вечер', 'город', 'море', 'горы', 'лес', 'дорога',
+    'кофе', 'книга', 'друзья', 'поезд', 'работа', 'отпуск', 'погода',
+    'кот', 'собака', 'прогулка', 'музей', 'концерт', 'рецепт', 'сад',
+    'сегодня', 'вчера', 'снова', 'наконец', 'очень', 'немного', 'совсем',
+    'увидел', 'решил', 'приготовил', 'прочитал', 'нашёл', 'вернулся',
+)
+PUB_DATE_RANGE = timedelta(days=730)
+SCHEDULED_RANGE = timedelta(days=7)
+UNPUBLISHED_SHARE = 0.05
+SCHEDULED_SHARE = 0.01
+# Тексты генерируются заранее и переиспользуются: случайный выбор слов для
+# каждой из миллионов строк занимал бы больше времени, чем сама вставка.
+TEXT_POOL_SIZE = 4096
+PLACEHOLDER_IMAGES = 8
+PLACEHOLDER_SIZE = (800, 600)
+
+
+def zipf_cum_weights(n, exponent):
+    total = 0.0
+    cum_weights = []
+    for rank in range(1, n + 1):
+        total += rank ** -exponent
+        cum_weights.append(total)
+    return cum_weights
+
+
+def next_pk(model):
+    return (model.objects.aggregate(Max('pk'))['pk__max'] or 0) + 1
+
+
+class Command(BaseCommand):
+    help = ('Быстро наполняет базу пользователями, категориями, '
+            'местоположениями, публикациями и комментариями.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--categories', type=int, default=10)
+        parser.add_argument('--locations', type=int, default=20)
+        parser.add_argument('--posts', type=int, default=10_000)
+        parser.add_argument('--comments', type=int, default=100_000)
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Зерно генератора: одинаковое зерно — одинаковые данные.')
+        parser.add_argument('--batch-size', type=int, default=10_000)
+        parser.add_argument(
+            '--hot-authors', type=float, default=1.0,
+            help='Показатель закона Ципфа для авторов постов; 0 — поровну.')
+        parser.add_argument(
+            '--hot-posts', type=float, default=1.0,
+            help='Показатель закона Ципфа для комментариев к постам.')
+        parser.add_argument(
+            '--images', type=float, default=0.0,
+            help='Доля постов с картинкой-заглушкой.')
+        parser.add_argument(
+            '--fixture',
+            help='JSON в формате loaddata: взять из него категории, '
+                 'местоположения и слова для текстов.')
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        started_at = time.perf_counter()
+        words = WORDS
+        if options['fixture']:
+            words = self.load_fixture(options['fixture']) or WORDS
+        else:
+            self.create_categories(options['categories'])
+            self.create_locations(options['locations'])
+        self.texts = {
+            size: [
+                ' '.join(self.rng.choices(words, k=self.rng.randint(*size)))
+                for _ in range(TEXT_POOL_SIZE)
+            ]
+            for size in ((2, 6), (20, 200), (3, 40))
+        }
+        user_ids = self.create_users(options['users'])
+        post_ids = self.create_posts(
+            options['posts'], options['comments'], user_ids, options)
+        self.create_comments(post_ids, user_ids)
+        # bulk_create и executemany не отправляют сигналы, поэтому кэш
+        # лент и дата следующей отложенной публикации сбрасываются здесь.
+        bulk_load_finished()
+        elapsed = time.perf_counter() - started_at
+        rows = (
+            options['users'] + options['posts'] + options['comments'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Создано строк: {rows} за {elapsed:.1f} с'
+            f' ({rows / elapsed:.0f} строк/с)'))
+
+    def bulk_create(self, model, objs):
+        for batch in batched(objs, self.batch_size):
+            with transaction.atomic():
+                model.objects.bulk_create(batch)
+
+    def text(self, size):
+        return self.rng.choice(self.texts[size])
+
+    def load_fixture(self, path):
+        with open(path, encoding='utf-8') as fixture:
+            objects = json.load(fixture)
+        for model in (Category, Location):
+            label = model._meta.label_lower
+            model.objects.bulk_create([
+                model(pk=obj['pk'], **obj['fields'])
+                for obj in objects if obj['model'] == label
+            ], ignore_conflicts=True)
+        return [
+            word
+            for obj in objects if obj['model'] == 'blog.post'
+            for word in obj['fields']['text'].split()
+        ]
+
+    def create_categories(self, count):
+        first = next_pk(Category)
+        self.bulk_create(Category, (
+            Category(
+                pk=pk,
+                title=f'Категория {pk}',
+                description=' '.join(self.rng.choices(WORDS, k=12)),
+                slug=f'category-{pk}',
+            )
+            for pk in range(first, first + count)
+        ))
+
+    def create_locations(self, count):
+        first = next_pk(Location)
+        self.bulk_create(Location, (
+            Location(pk=pk, name=f'Место {pk}')
+            for pk in range(first, first + count)
+        ))
+
+    def create_users(self, count):
+        first = next_pk(User)
+        self.bulk_create(User, (
+            User(pk=pk, username=f'user{pk}', password='!')
+            for pk in range(first, first + count)
+        ))
+        return range(first, first + count)
+
+    def create_placeholders(self):
+        names = []
+        for number in range(PLACEHOLDER_IMAGES):
+            color = tuple(self.rng.randrange(256) for _ in range(3))
+            buffer = io.BytesIO()
+            Image.new('RGB', PLACEHOLDER_SIZE, color).save(buffer, 'JPEG')
+            names.append(default_storage.save(
+                f'images/seed/placeholder_{number}.jpg',
+                ContentFile(buffer.getvalue())))
+        return names
+
+    def create_posts(self, count, comments, user_ids, options):
+        rng = self.rng
+        category_ids = list(Category.objects.values_list('pk', flat=True))
+        location_ids = [
+            *Location.objects.values_list('pk', flat=True), None]
+        images = self.create_placeholders() if options['images'] else []
+        authors = rng.choices(
+            user_ids,
+            cum_weights=zipf_cum_weights(
+                len(user_ids), options['hot_authors']),
+            k=count)
+        first = next_pk(Post)
+        post_ids = range(first, first + count)
+        # bulk_create не отправляет сигналы, поэтому счётчики комментариев
+        # считаются заранее и записываются вместе с постами.
+        self.comment_counts = Counter(rng.choices(
+            post_ids,
+            cum_weights=zipf_cum_weights(count, options['hot_posts']),
+            k=comments)) if count else Counter()
+        now = timezone.now()
+
+        def make_post(number, pk):
+            if rng.random() < SCHEDULED_SHARE:
+                pub_date = now + rng.random() * SCHEDULED_RANGE
+            else:
+                pub_date = now - rng.random() * PUB_DATE_RANGE
+            image = ''
+            if images and rng.random() < options['images']:
+                image = rng.choice(images)
+            return Post(
+                pk=pk,
+                title=self.text((2, 6))[:const.CHAR_FIELD_LEN],
+                text=self.text((20, 200)),
+                pub_date=pub_date,
+                author_id=authors[number],
+                category_id=rng.choice(category_ids),
+                location_id=rng.choice(location_ids),
+                image=image,
+                is_published=rng.random() >= UNPUBLISHED_SHARE,
+                comment_count=self.comment_counts[pk],
+            )
+
+        self.bulk_create(Post, itertools.starmap(
+            make_post, enumerate(post_ids)))
+        return post_ids
+
+    def create_comments(self, post_ids, user_ids):
+        rng = self.rng
+        created_at = connection.ops.adapt_datetimefield_value(timezone.now())
+        # Для самой большой таблицы построчная подготовка полей в
+        # bulk_create обходится дороже самой вставки.
+        insert_rows(Comment, ('post', 'author', 'text', 'created_at'), (
+            (post_id, rng.choice(user_ids), self.text((3, 40)), created_at)
+            for post_id in post_ids
+            for _ in range(self.comment_counts[post_id])
+        ), self.batch_size)
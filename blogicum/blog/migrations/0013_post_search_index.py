@@ -0,0 +1,53 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0012_feed_indexes'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=[
+                """
+                CREATE VIRTUAL TABLE blog_post_fts USING fts5(
+                    title, text,
+                    content='blog_post', content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2')
+                """,
+                """
+                CREATE TRIGGER blog_post_fts_insert
+                AFTER INSERT ON blog_post BEGIN
+                    INSERT INTO blog_post_fts(rowid, title, text)
+                    VALUES (new.id, new.title, new.text);
+                END
+                """,
+                """
+                CREATE TRIGGER blog_post_fts_delete
+                AFTER DELETE ON blog_post BEGIN
+                    INSERT INTO blog_post_fts(
+                        blog_post_fts, rowid, title, text)
+                    VALUES ('delete', old.id, old.title, old.text);
+                END
+                """,
+                """
+                CREATE TRIGGER blog_post_fts_update
+                AFTER UPDATE OF title, text ON blog_post BEGIN
+                    INSERT INTO blog_post_fts(
+                        blog_post_fts, rowid, title, text)
+                    VALUES ('delete', old.id, old.title, old.text);
+                    INSERT INTO blog_post_fts(rowid, title, text)
+                    VALUES (new.id, new.title, new.text);
+                END
+                """,
+                "INSERT INTO blog_post_fts(blog_post_fts) VALUES ('rebuild')",
+            ],
+            reverse_sql=[
+                'DROP TRIGGER IF EXISTS blog_post_fts_insert',
+                'DROP TRIGGER IF EXISTS blog_post_fts_delete',
+                'DROP TRIGGER IF EXISTS blog_post_fts_update',
+                'DROP TABLE IF EXISTS blog_post_fts',
+            ],
+        ),
+    ]
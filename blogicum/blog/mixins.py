@@ -1,12 +1,40 @@
+from http import HTTPStatus
+
 from django.contrib.auth.mixins import UserPassesTestMixin
+from django.core.cache import cache
+from django.core.paginator import InvalidPage
+from django.http import Http404
+from django.shortcuts import get_object_or_404
 from django.urls import reverse_lazy
+from django.utils.decorators import method_decorator
+from django.utils.http import urlencode
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
+
+from blog.cache import page_cache_key
+from blog.paginators import CursorPaginator
+from blog.schedule import timeout_until_next_pub_date
+from blog.uploads import ImageUploadHandler
+from core.db import pin_to_primary
+from core.metrics import record_cache
+import blog.constants as const
 
 
 class OnlyAuthorMixin(UserPassesTestMixin):
 
     def test_func(self):
-        object = self.get_object()
-        return object.author == self.request.user
+        author_id = get_object_or_404(
+            self.get_queryset().values_list('author_id', flat=True),
+            pk=self.kwargs[self.pk_url_kwarg])
+        return author_id == self.request.user.pk
+
+
+class DeferTextOnDeleteMixin():
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        if self.request.method == 'POST':
+            return qs.defer('text')
+        return qs
 
 
 class PostSuccessURLMixin():
@@ -23,3 +51,89 @@ class ProfileSuccessURLMixin():
         return reverse_lazy(
             'blog:profile',
             kwargs={'username': self.request.user.username})
+
+
+class PinToPrimaryMixin():
+    # После записи автор какое-то время читает с основной базы, чтобы не
+    # увидеть старые данные с отстающей реплики.
+
+    def form_valid(self, form):
+        response = super().form_valid(form)
+        pin_to_primary(self.request)
+        return response
+
+    def delete(self, request, *args, **kwargs):
+        response = super().delete(request, *args, **kwargs)
+        pin_to_primary(request)
+        return response
+
+
+class ImageUploadMixin():
+    # Обработчик загрузки подменяется до чтения тела запроса, а CSRF-токен
+    # читается из POST, поэтому проверка CSRF переносится внутрь dispatch.
+
+    @method_decorator(csrf_exempt)
+    def dispatch(self, request, *args, **kwargs):
+        request.upload_handlers = [ImageUploadHandler(request)]
+        return csrf_protect(super().dispatch)(request, *args, **kwargs)
+
+
+class CursorPaginationMixin():
+
+    cursor_kwarg = 'cursor'
+
+    def paginate_queryset(self, queryset, page_size):
+        if self.cursor_kwarg not in self.request.GET:
+            return super().paginate_queryset(queryset, page_size)
+        paginator = CursorPaginator(queryset, page_size)
+        try:
+            page = paginator.page(self.request.GET[self.cursor_kwarg])
+        except InvalidPage:
+            raise Http404
+        return (paginator, page, page.object_list, page.has_other_pages())
+
+
+class AnonymousPageCacheMixin():
+
+    page_cache_groups = ('page:feed',)
+    # Параметры запроса, от которых зависит страница. Запросы с любыми
+    # другими параметрами не кэшируются, иначе каждая выдуманная строка
+    # запроса занимала бы в кэше отдельную запись.
+    page_cache_params = ('page', 'cursor', 'comments_cursor')
+
+    def get_page_cache_groups(self):
+        return self.page_cache_groups
+
+    def get_page_cache_path(self):
+        query = self.request.GET
+        if any(name not in self.page_cache_params
+               or len(query.getlist(name)) > 1 for name in query):
+            return None
+        if not query:
+            return self.request.path
+        return f'{self.request.path}?{urlencode(sorted(query.items()))}'
+
+    def get_page_cache_timeout(self):
+        return timeout_until_next_pub_date(const.PAGE_CACHE_TIMEOUT)
+
+    def dispatch(self, request, *args, **kwargs):
+        if (request.method not in ('GET', 'HEAD')
+                or request.user.is_authenticated):
+            return super().dispatch(request, *args, **kwargs)
+        path = self.get_page_cache_path()
+        if path is None:
+            return super().dispatch(request, *args, **kwargs)
+        key = page_cache_key(path, self.get_page_cache_groups())
+        response = cache.get(key)
+        record_cache('page', response is not None)
+        if response is not None:
+            return response
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code == HTTPStatus.OK:
+            timeout = self.get_page_cache_timeout()
+            if hasattr(response, 'render') and callable(response.render):
+                response.add_post_render_callback(
+                    lambda r: cache.set(key, r, timeout))
+            else:
+                cache.set(key, response, timeout)
+        return response
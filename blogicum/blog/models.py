@@ -1,6 +1,17 @@
 from django.contrib.auth import get_user_model
-from django.db import models
-
+from django.db import models, router, transaction
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from blog.search import (
+    FTS_TABLE,
+    build_match_query,
+    search_highlight,
+    search_match,
+    search_rank,
+    search_snippet)
 from core.models import PublishedModel, CreatedModel
 import blog.constants as const
 
@@ -43,6 +54,56 @@ class Location(PublishedModel, CreatedModel):
         return self.name
 
 
+class PostQuerySet(models.QuerySet):
+
+    def published(self):
+        return self.filter(
+            is_published=True,
+            pub_date__lt=timezone.now())
+
+    def feed(self):
+        return self.select_related(
+            'author', 'category', 'location'
+        ).only(*const.FEED_POST_FIELDS)
+
+    def matching(self, text):
+        match = build_match_query(text)
+        if not match:
+            return self.none()
+        return self.filter(pk__in=RawSQL(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+            (match,)))
+
+    def search(self, text):
+        match = build_match_query(text)
+        if not match:
+            return self.none()
+        # isnull=False делает соединение с индексом внутренним: тогда SQLite
+        # начинает с поиска по индексу, а не проверяет MATCH для каждого
+        # поста.
+        return self.filter(
+            search_match(match), search_index__isnull=False,
+        ).annotate(
+            rank=search_rank(),
+            title_highlight=search_highlight(),
+            text_snippet=search_snippet(),
+        ).order_by('rank', '-pub_date')
+
+    def delete(self):
+        with transaction.atomic(using=self.db):
+            Comment.objects.filter(post__in=self).delete_in_bulk(self.db)
+            return super().delete()
+
+    def recount_comments(self):
+        counts = Comment.objects.filter(
+            post=OuterRef('pk')
+        ).order_by().values('post').annotate(
+            count=Count('pk')
+        ).values('count')
+        return self.update(
+            comment_count=Coalesce(Subquery(counts), 0))
+
+
 class Post(PublishedModel, CreatedModel):
     title = models.CharField(
         verbose_name='Заголовок',
@@ -79,14 +140,75 @@ class Post(PublishedModel, CreatedModel):
         on_delete=models.SET_NULL,
         null=True,)
 
+    comment_count = models.PositiveIntegerField(
+        verbose_name='Количество комментариев',
+        default=0,
+        editable=False,)
+
+    objects = PostQuerySet.as_manager()
+
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         ordering = ('-pub_date',)
+        indexes = (
+            models.Index(
+                fields=('-pub_date',),
+                condition=Q(is_published=True),
+                name='post_published_feed_idx'),
+            models.Index(
+                fields=('category', '-pub_date'),
+                condition=Q(is_published=True),
+                name='post_category_feed_idx'),
+            models.Index(
+                fields=('author', '-pub_date'),
+                name='post_author_feed_idx'),
+        )
 
     def __str__(self):
         return self.title
 
+    def delete(self, using=None, keep_parents=False):
+        using = using or router.db_for_write(Post, instance=self)
+        with transaction.atomic(using=using):
+            Comment.objects.filter(post=self).delete_in_bulk(using)
+            return super().delete(using, keep_parents)
+
+
+class PostSearchIndex(models.Model):
+    # Таблица FTS5, которую создаёт blog.search.install_search_index().
+    # Модель нужна только для соединения с постами в PostQuerySet.search().
+    post = models.OneToOneField(
+        Post,
+        primary_key=True,
+        db_column='rowid',
+        on_delete=models.DO_NOTHING,
+        related_name='search_index',)
+
+    title = models.TextField()
+
+    text = models.TextField()
+
+    class Meta:
+        managed = False
+        db_table = FTS_TABLE
+
+
+class CommentQuerySet(models.QuerySet):
+
+    def delete_in_bulk(self, using):
+        # Комментарии удаляемых постов удаляются одним DELETE, без загрузки
+        # строк и без сигналов: счётчик и кэш страниц удаляемого поста
+        # обновлять незачем, а сигналы самого поста сбрасывают ленты.
+        return self._raw_delete(using)
+
+    def for_post(self, post_id):
+        return self.filter(
+            post_id=post_id
+        ).select_related(
+            'author'
+        ).only(*const.COMMENT_LIST_FIELDS)
+
 
 class Comment(CreatedModel):
     text = models.TextField(
@@ -102,10 +224,17 @@ class Comment(CreatedModel):
         to=Post,
         on_delete=models.CASCADE,)
 
+    objects = CommentQuerySet.as_manager()
+
     class Meta:
         verbose_name = 'комментарий'
         verbose_name_plural = 'Коментарии'
         ordering = ('created_at',)
+        indexes = (
+            models.Index(
+                fields=('post', 'created_at'),
+                name='comment_post_created_idx'),
+        )
 
     def __str__(self):
         return str(self.id)
@@ -0,0 +1,152 @@
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import InvalidPage, Page, Paginator
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+from blog.cache import get_or_set
+from blog.schedule import timeout_until_next_pub_date
+import blog.constants as const
+
+
+class WindowedPage(Page):
+
+    @property
+    def page_window(self):
+        return range(
+            max(1, self.number - const.PAGINATOR_WINDOW),
+            min(self.paginator.num_pages,
+                self.number + const.PAGINATOR_WINDOW) + 1)
+
+
+class CachedCountPaginator(Paginator):
+
+    def __init__(self, *args, count_cache_key=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.count_cache_key = count_cache_key
+
+    def _uncached_count(self):
+        return self.object_list.count()
+
+    @cached_property
+    def count(self):
+        if self.count_cache_key is None:
+            return self._uncached_count()
+        return get_or_set(
+            'posts',
+            ('count', self.count_cache_key),
+            self._uncached_count,
+            timeout_until_next_pub_date(const.POST_COUNT_CACHE_TIMEOUT))
+
+    def _get_page(self, *args, **kwargs):
+        return WindowedPage(*args, **kwargs)
+
+
+class CursorPage(Sequence):
+
+    is_cursor_page = True
+
+    def __init__(self, object_list, paginator, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return f'<Cursor page of {len(self)} objects>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+# Курсор хранит значения полей ordering у крайнего объекта страницы,
+# последнее поле ordering должно быть уникальным.
+class CursorPaginator:
+
+    def __init__(self, object_list, per_page, ordering=('-pub_date', '-pk')):
+        self.object_list = object_list.order_by(*ordering)
+        self.per_page = per_page
+        opts = object_list.model._meta
+        self.fields = [
+            (
+                opts.pk if name.lstrip('-') == 'pk'
+                else opts.get_field(name.lstrip('-')),
+                name.startswith('-'),
+            )
+            for name in ordering
+        ]
+
+    def encode_cursor(self, obj, forward):
+        data = [
+            forward,
+            [field.value_to_string(obj) for field, _ in self.fields],
+        ]
+        token = base64.urlsafe_b64encode(json.dumps(data).encode())
+        return token.decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        try:
+            padding = '=' * (-len(cursor) % 4)
+            forward, raw_values = json.loads(
+                base64.urlsafe_b64decode(cursor + padding))
+            if len(raw_values) != len(self.fields):
+                raise ValueError
+            values = [
+                field.to_python(value)
+                for (field, _), value in zip(self.fields, raw_values)
+            ]
+        except (
+                binascii.Error,
+                TypeError,
+                ValueError,
+                ValidationError):
+            raise InvalidPage('Некорректный курсор')
+        return bool(forward), values
+
+    def keyset_filter(self, values, forward):
+        condition = Q()
+        equal = Q()
+        for (field, descending), value in zip(self.fields, values):
+            lookup = 'lt' if descending == forward else 'gt'
+            condition |= equal & Q(**{f'{field.attname}__{lookup}': value})
+            equal &= Q(**{field.attname: value})
+        return condition
+
+    def page(self, cursor=''):
+        forward, values = (
+            self.decode_cursor(cursor) if cursor else (True, None))
+        qs = self.object_list
+        if values is not None:
+            qs = qs.filter(self.keyset_filter(values, forward))
+        if not forward:
+            qs = qs.reverse()
+        object_list = list(qs[:self.per_page + 1])
+        has_more = len(object_list) > self.per_page
+        del object_list[self.per_page:]
+        if forward:
+            has_next, has_previous = has_more, values is not None
+        else:
+            object_list.reverse()
+            has_next, has_previous = True, has_more
+        next_cursor = previous_cursor = None
+        if object_list and has_next:
+            next_cursor = self.encode_cursor(object_list[-1], True)
+        if object_list and has_previous:
+            previous_cursor = self.encode_cursor(object_list[0], False)
+        return CursorPage(object_list, self, next_cursor, previous_cursor)
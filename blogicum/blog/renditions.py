@@ -0,0 +1,106 @@
+import os
+from io import BytesIO
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps, features
+
+from blog.cache import bump_version, make_key
+from blog.models import Post
+from core.jobs import enqueue_many, enqueue_on_commit
+import blog.constants as const
+
+RENDITIONS_DIR = 'renditions'
+RENDITIONS_TASK = 'blog.renditions.generate_renditions'
+
+# Картинки без копий, замеченные при отрисовке шаблонов: задачи на них
+# ставятся одним запросом уже после отправки ответа.
+pending_images = set()
+
+
+def get_rendition_format():
+    if features.check('webp'):
+        return 'WEBP', 'webp'
+    return 'JPEG', 'jpg'
+
+
+def get_rendition_name(image_name, rendition):
+    _, extension = get_rendition_format()
+    stem, _ = os.path.splitext(image_name)
+    return f'{RENDITIONS_DIR}/{rendition}/{stem}.{extension}'
+
+
+def generate_rendition(image_name, rendition, storage=default_storage):
+    image_format, _ = get_rendition_format()
+    with storage.open(image_name) as image_file:
+        with Image.open(image_file) as image:
+            image = ImageOps.exif_transpose(image)
+            image.thumbnail(
+                const.IMAGE_RENDITIONS[rendition], Image.Resampling.LANCZOS)
+            if image_format == 'JPEG' and image.mode != 'RGB':
+                image = image.convert('RGB')
+            elif image.mode not in ('RGB', 'RGBA'):
+                image = image.convert('RGBA')
+            buffer = BytesIO()
+            image.save(
+                buffer, image_format, quality=const.RENDITION_QUALITY)
+    name = get_rendition_name(image_name, rendition)
+    if storage.exists(name):
+        storage.delete(name)
+    storage.save(name, ContentFile(buffer.getvalue()))
+    return name
+
+
+def renditions_changed(image_name):
+    # Карточки и страницы, отрисованные до появления копий, ссылаются на
+    # оригинал картинки.
+    post_ids = list(
+        Post.objects.filter(image=image_name).values_list('pk', flat=True))
+    for post_id in post_ids:
+        bump_version(f'post:{post_id}')
+        bump_version(f'page:post:{post_id}')
+    if post_ids:
+        bump_version('page:feed')
+
+
+def generate_renditions(image_name, storage=default_storage, force=False):
+    generated = False
+    for rendition in const.IMAGE_RENDITIONS:
+        name = get_rendition_name(image_name, rendition)
+        if force or not storage.exists(name):
+            generate_rendition(image_name, rendition, storage)
+            generated = True
+    if generated:
+        renditions_changed(image_name)
+
+
+def request_renditions(image_name, defer=False):
+    if not cache.add(
+            make_key('rendition-job', image_name), True,
+            const.RENDITION_JOB_TIMEOUT):
+        return
+    if defer:
+        pending_images.add(image_name)
+    else:
+        enqueue_on_commit(RENDITIONS_TASK, image_name=image_name)
+
+
+def enqueue_pending_renditions():
+    global pending_images
+    images, pending_images = pending_images, set()
+    if images:
+        enqueue_many(
+            RENDITIONS_TASK,
+            [{'image_name': image_name} for image_name in sorted(images)])
+
+
+def get_rendition_url(image, rendition):
+    # Копии создаёт только фоновая задача: пока копии нет, отдаётся
+    # оригинал, а задача ставится в очередь не чаще раза в
+    # RENDITION_JOB_TIMEOUT.
+    name = get_rendition_name(image.name, rendition)
+    if not image.storage.exists(name):
+        request_renditions(image.name, defer=True)
+        return image.url
+    return image.storage.url(name)
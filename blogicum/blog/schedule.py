@@ -0,0 +1,40 @@
+import math
+
+from django.core.cache import cache
+from django.db.models import Min
+from django.utils import timezone
+
+from blog.cache import make_key
+from blog.models import Post
+
+NEXT_PUB_DATE_KEY = make_key('next_pub_date')
+# Маркер в кэше: отложенных публикаций нет.
+NOTHING_SCHEDULED = 'nothing'
+
+
+def get_next_pub_date():
+    now = timezone.now()
+    next_pub_date = cache.get(NEXT_PUB_DATE_KEY)
+    if next_pub_date is None or (
+            next_pub_date != NOTHING_SCHEDULED and next_pub_date <= now):
+        next_pub_date = Post.objects.filter(
+            is_published=True,
+            pub_date__gt=now,
+        ).aggregate(next_pub_date=Min('pub_date'))['next_pub_date']
+        cache.set(
+            NEXT_PUB_DATE_KEY, next_pub_date or NOTHING_SCHEDULED, None)
+    if next_pub_date == NOTHING_SCHEDULED:
+        return None
+    return next_pub_date
+
+
+def reset_next_pub_date():
+    cache.delete(NEXT_PUB_DATE_KEY)
+
+
+def timeout_until_next_pub_date(timeout):
+    next_pub_date = get_next_pub_date()
+    if next_pub_date is None:
+        return timeout
+    seconds = (next_pub_date - timezone.now()).total_seconds()
+    return max(1, min(timeout, math.ceil(seconds)))
@@ -0,0 +1,138 @@
+import re
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.recorder import MigrationRecorder
+from django.db.models import BooleanField, F, FloatField, Func, TextField
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+import blog.constants as const
+
+FTS_TABLE = 'blog_post_fts'
+SEARCH_INDEX_MIGRATION = ('blog', '0013_post_search_index')
+# Границы совпадений в highlight()/snippet(): управляющие символы не
+# встречаются в тексте поста и не меняются при экранировании HTML.
+MARK_START = '\x02'
+MARK_END = '\x03'
+
+# Внешний индекс поверх blog_post: сам текст хранится только в таблице
+# постов, триггеры поддерживают индекс при любых изменениях, в том числе
+# при bulk_create и update(), которые не отправляют сигналы. Индекс
+# создаёт миграция 0013, но SQLite удаляет триггеры при пересоздании
+# таблицы, поэтому после каждого migrate они восстанавливаются тем же SQL,
+# см. restore_search_index(). При правке SQL нужно поменять и миграцию.
+SEARCH_INDEX_SQL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, text,
+        content='blog_post', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2')
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert
+    AFTER INSERT ON blog_post BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, text)
+        VALUES (new.id, new.title, new.text);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete
+    AFTER DELETE ON blog_post BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, text)
+        VALUES ('delete', old.id, old.title, old.text);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update
+    AFTER UPDATE OF title, text ON blog_post BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, text)
+        VALUES ('delete', old.id, old.title, old.text);
+        INSERT INTO {FTS_TABLE}(rowid, title, text)
+        VALUES (new.id, new.title, new.text);
+    END
+    """,
+]
+TRIGGER_NAMES = (
+    f'{FTS_TABLE}_insert', f'{FTS_TABLE}_delete', f'{FTS_TABLE}_update')
+
+
+def install_search_index(connection):
+    if connection.vendor != 'sqlite':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT count(*) FROM sqlite_master"
+            " WHERE type = 'trigger' AND name IN (%s, %s, %s)",
+            TRIGGER_NAMES)
+        if cursor.fetchone()[0] == len(TRIGGER_NAMES):
+            return False
+        for sql in SEARCH_INDEX_SQL:
+            cursor.execute(sql)
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+    return True
+
+
+def restore_search_index(using=DEFAULT_DB_ALIAS, **kwargs):
+    # Вызывается по сигналу post_migrate. Если триггеры пропали,
+    # install_search_index() создаёт их заново и перестраивает индекс.
+    connection = connections[using]
+    applied = MigrationRecorder(connection).applied_migrations()
+    if SEARCH_INDEX_MIGRATION in applied:
+        install_search_index(connection)
+
+
+class SearchIndexSQL(Func):
+    # Фрагмент SQL над присоединённой таблицей индекса: MATCH или
+    # вспомогательная функция FTS5 (bm25, highlight, snippet). Псевдоним
+    # таблицы берётся из запроса, а не из имени таблицы.
+
+    def __init__(self, sql, params=(), output_field=None):
+        super().__init__(F('search_index__title'), output_field=output_field)
+        self.sql = sql
+        self.params = tuple(params)
+
+    def as_sql(self, compiler, connection, **extra_context):
+        alias = compiler.quote_name_unless_alias(
+            self.source_expressions[0].alias)
+        index = f'{alias}.{connection.ops.quote_name(FTS_TABLE)}'
+        return self.sql.format(index=index), self.params
+
+
+def search_match(match):
+    return SearchIndexSQL(
+        '{index} MATCH %s', (match,), output_field=BooleanField())
+
+
+def search_rank():
+    return SearchIndexSQL(
+        'bm25({index}, %s, %s)',
+        (const.SEARCH_TITLE_WEIGHT, const.SEARCH_TEXT_WEIGHT),
+        output_field=FloatField())
+
+
+def search_highlight():
+    return SearchIndexSQL(
+        'highlight({index}, 0, %s, %s)',
+        (MARK_START, MARK_END), output_field=TextField())
+
+
+def search_snippet():
+    return SearchIndexSQL(
+        "snippet({index}, 1, %s, %s, '…', %s)",
+        (MARK_START, MARK_END, const.SEARCH_SNIPPET_WORDS),
+        output_field=TextField())
+
+
+def build_match_query(text):
+    # Каждое слово ищется по префиксу, все слова обязательны. Кавычки
+    # исключают разбор пользовательского ввода как синтаксиса FTS5.
+    words = re.findall(r'\w+', text)[:const.SEARCH_MAX_WORDS]
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def render_highlight(value):
+    return mark_safe(
+        escape(value)
+        .replace(MARK_START, '<mark>')
+        .replace(MARK_END, '</mark>'))
@@ -0,0 +1,137 @@
+from django.contrib.auth import get_user_model
+from django.core.signals import request_finished
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from blog.cache import bump_version
+from blog.constants import AUTHOR_CARD_FIELDS
+from blog.models import Category, Comment, Location, Post
+from blog.renditions import (
+    enqueue_pending_renditions, get_rendition_name, request_renditions)
+from blog.schedule import reset_next_pub_date
+
+User = get_user_model()
+
+
+def change_comment_count(post_id, delta):
+    # Счётчик мог разойтись с реальностью после loaddata или bulk_create:
+    # он не должен уходить ниже нуля, иначе удаление упадёт на CHECK.
+    Post.objects.filter(pk=post_id).update(
+        comment_count=Greatest(F('comment_count') + delta, 0))
+
+
+@receiver(pre_save, sender=Comment)
+def comment_saving(sender, instance, raw=False, **kwargs):
+    # Комментарий можно перенести к другому посту, например в админке:
+    # прежний post_id нужен, чтобы перенести и счётчик.
+    instance._previous_post_id = None
+    if instance.pk is not None and not raw:
+        instance._previous_post_id = (
+            sender.objects.filter(pk=instance.pk)
+            .values_list('post_id', flat=True).first())
+
+
+@receiver(post_save, sender=Comment)
+def comment_created(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previous_post_id = getattr(instance, '_previous_post_id', None)
+    if created:
+        change_comment_count(instance.post_id, 1)
+    elif previous_post_id and previous_post_id != instance.post_id:
+        change_comment_count(previous_post_id, -1)
+        change_comment_count(instance.post_id, 1)
+        bump_version(f'page:post:{previous_post_id}')
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    change_comment_count(instance.post_id, -1)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def post_list_changed(sender, **kwargs):
+    bump_version('posts')
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Location)
+def card_object_changed(sender, instance, **kwargs):
+    bump_version(f'{sender._meta.model_name}:{instance.pk}')
+
+
+@receiver(pre_save, sender=User)
+def author_saving(sender, instance, raw=False, update_fields=None, **kwargs):
+    # В карточке поста видны только имя и логин автора: вход, смена пароля
+    # и другие правки профиля не должны сбрасывать кэш всех страниц.
+    instance._author_changed = False
+    if instance.pk is None or raw:
+        return
+    if update_fields is not None and set(update_fields).isdisjoint(
+            AUTHOR_CARD_FIELDS):
+        return
+    previous = (
+        sender.objects.filter(pk=instance.pk)
+        .values_list(*AUTHOR_CARD_FIELDS).first())
+    instance._author_changed = previous != tuple(
+        getattr(instance, field) for field in AUTHOR_CARD_FIELDS)
+
+
+@receiver(post_save, sender=User)
+def card_author_changed(sender, instance, created, **kwargs):
+    if created or not getattr(instance, '_author_changed', False):
+        return
+    bump_version(f'user:{instance.pk}')
+    bump_version('page:all')
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def post_page_changed(sender, instance, **kwargs):
+    reset_next_pub_date()
+    bump_version('page:feed')
+    bump_version(f'page:post:{instance.pk}')
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_page_changed(sender, instance, **kwargs):
+    bump_version('page:feed')
+    bump_version(f'page:post:{instance.post_id}')
+
+
+@receiver(post_delete, sender=User)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def all_pages_changed(sender, **kwargs):
+    bump_version('page:all')
+
+
+def bulk_load_finished():
+    # Для команд, которые вставляют строки мимо save() и сигналов.
+    reset_next_pub_date()
+    bump_version('posts')
+    bump_version('page:all')
+    bump_version('cards')
+
+
+@receiver(post_save, sender=Post)
+def post_image_saved(sender, instance, raw=False, **kwargs):
+    if not instance.image or raw:
+        return
+    if not instance.image.storage.exists(
+            get_rendition_name(instance.image.name, 'full')):
+        request_renditions(instance.image.name)
+
+
+@receiver(request_finished)
+def rendition_jobs_requested(sender, **kwargs):
+    enqueue_pending_renditions()
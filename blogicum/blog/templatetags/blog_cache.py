@@ -0,0 +1,40 @@
+from django import template
+from django.templatetags.cache import CacheNode, do_cache
+
+from core.metrics import record_cache
+
+register = template.Library()
+
+
+class MissNode(template.Node):
+    # Первый узел кэшируемого фрагмента: рендерится, только если фрагмента
+    # нет в кэше, и отмечает промах для своего CountedCacheNode.
+
+    def __init__(self, cache_node):
+        self.cache_node = cache_node
+
+    def render(self, context):
+        context.render_context[self.cache_node] = False
+        return ''
+
+
+class CountedCacheNode(CacheNode):
+
+    def __init__(self, node):
+        super().__init__(
+            template.NodeList([MissNode(self), *node.nodelist]),
+            node.expire_time_var, node.fragment_name, node.vary_on,
+            node.cache_name)
+
+    def render(self, context):
+        context.render_context[self] = True
+        value = super().render(context)
+        record_cache(self.fragment_name, context.render_context[self])
+        return value
+
+
+@register.tag('cache')
+def do_counted_cache(parser, token):
+    # Тот же {% cache %}, что и в django.templatetags.cache, но попадания и
+    # промахи попадают в метрику blogicum_cache_requests_total.
+    return CountedCacheNode(do_cache(parser, token))
@@ -0,0 +1,12 @@
+from django import template
+
+from blog.renditions import get_rendition_url
+
+register = template.Library()
+
+
+@register.filter
+def rendition(image, name):
+    if not image:
+        return ''
+    return get_rendition_url(image, name)
@@ -0,0 +1,88 @@
+import logging
+import time
+import warnings
+from io import BytesIO
+
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from PIL import Image
+
+import blog.constants as const
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+
+def get_peak_rss():
+    # Пиковый RSS процесса: ядро считает его само, без накладных расходов
+    # на каждую аллокацию. На Linux значение в килобайтах.
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+class ImageUploadHandler(TemporaryFileUploadHandler):
+    # Пишет файл на диск частями и отбрасывает загрузку, как только
+    # превышен размер или заголовок картинки говорит о слишком большом
+    # разрешении. Ошибку проверяет поле формы по атрибуту upload_error.
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.file.upload_error = None
+        self.started_at = time.perf_counter()
+        self.received = 0
+        self.chunks = 0
+        self.header = BytesIO()
+        self.header_checked = False
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        self.chunks += 1
+        if self.file.upload_error:
+            return None
+        if self.received > const.MAX_IMAGE_UPLOAD_SIZE:
+            self.file.upload_error = 'too_large'
+            return None
+        if not self.header_checked:
+            self.check_header(raw_data)
+            if self.file.upload_error:
+                return None
+        self.file.write(raw_data)
+        return None
+
+    def check_header(self, raw_data):
+        self.header.write(raw_data)
+        self.header.seek(0)
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', Image.DecompressionBombWarning)
+                with Image.open(self.header) as image:
+                    width, height = image.size
+        except Image.DecompressionBombError:
+            self.file.upload_error = 'too_many_pixels'
+            return
+        except Exception:
+            # Заголовок ещё не прочитан целиком или это не картинка —
+            # второе проверит поле формы.
+            self.header.seek(0, 2)
+            if self.header.tell() >= const.IMAGE_HEADER_MAX_SIZE:
+                self.header_checked = True
+            return
+        self.header_checked = True
+        if width * height > const.MAX_IMAGE_PIXELS:
+            self.file.upload_error = 'too_many_pixels'
+
+    def file_complete(self, file_size):
+        upload = super().file_complete(file_size)
+        upload.upload_metrics = {
+            'bytes': self.received,
+            'chunks': self.chunks,
+            'seconds': time.perf_counter() - self.started_at,
+            'peak_rss': get_peak_rss(),
+            'rejected': upload.upload_error,
+        }
+        logger.info('Upload %s: %s', self.file_name, upload.upload_metrics)
+        return upload
@@ -1,8 +1,8 @@
-from datetime import datetime, timezone
+from urllib.parse import urlencode
 
 from django.shortcuts import get_object_or_404
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
-from django.db.models import Count
+from django.core.paginator import InvalidPage
 from django.http.response import Http404
 from django.shortcuts import redirect
 from django.views.generic import (
@@ -13,10 +13,18 @@ from django.views.generic import (
     DetailView)
 from django.contrib.auth import get_user_model
 
+from blog.cache import set_card_versions
 from blog.forms import ProfileForm, PostForm, CommentForm
 from blog.models import Post, Category, Comment
+from blog.paginators import CachedCountPaginator, CursorPaginator
+from blog.search import render_highlight
 from blog.mixins import (
+    AnonymousPageCacheMixin,
+    CursorPaginationMixin,
+    DeferTextOnDeleteMixin,
+    ImageUploadMixin,
     OnlyAuthorMixin,
+    PinToPrimaryMixin,
     PostSuccessURLMixin,
     ProfileSuccessURLMixin)
 import blog.constants as const
@@ -25,26 +33,40 @@ import blog.constants as const
 User = get_user_model()
 
 
-def annotate_comment_count(qs):
-    return qs.annotate(comment_count=Count('comment')).order_by('-pub_date')
+class PostsListView(
+        AnonymousPageCacheMixin,
+        CursorPaginationMixin,
+        ListView):
 
+    model = Post
+    paginate_by = const.POSTS_AT_PAGE
+    read_from_replica = True
+    paginator_class = CachedCountPaginator
 
-def qs_filter_list_view(qs, **kwargs):
-    return annotate_comment_count(
-        qs.filter(
-            **kwargs,
-            pub_date__lt=datetime.now(tz=timezone.utc),
-            is_published=True))
+    def get_queryset(self):
+        return Post.objects.feed()
 
+    def get_count_cache_key(self):
+        return ':'.join(
+            [self.__class__.__name__, *map(str, self.kwargs.values())])
 
-class PostsListView(ListView):
+    def get_paginator(self, *args, **kwargs):
+        return super().get_paginator(
+            *args, count_cache_key=self.get_count_cache_key(), **kwargs)
 
-    model = Post
-    ordering = ['-pub_date']
-    paginate_by = const.POSTS_AT_PAGE
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        set_card_versions(context['page_obj'])
+        context['card_cache_timeout'] = const.POST_CARD_CACHE_TIMEOUT
+        return context
 
 
-class PostCreateView(ProfileSuccessURLMixin, LoginRequiredMixin, CreateView):
+class PostCreateView(
+        ImageUploadMixin,
+        PinToPrimaryMixin,
+        ProfileSuccessURLMixin,
+        LoginRequiredMixin,
+        CreateView):
 
     model = Post
     form_class = PostForm
@@ -55,29 +77,57 @@ class PostCreateView(ProfileSuccessURLMixin, LoginRequiredMixin, CreateView):
         return super().form_valid(form)
 
 
-class PostDetailView(UserPassesTestMixin, DetailView):
+class PostDetailView(
+        AnonymousPageCacheMixin,
+        UserPassesTestMixin,
+        DetailView):
 
     model = Post
     pk_url_kwarg = 'post_id'
     template_name = 'blog/detail.html'
+    read_from_replica = True
+
+    def get_page_cache_groups(self):
+        return (f'page:post:{self.kwargs["post_id"]}',)
+
+    def get_queryset(self):
+        return super().get_queryset().select_related(
+            'author', 'category', 'location')
+
+    def get_object(self, queryset=None):
+        if getattr(self, 'object', None) is None:
+            self.object = super().get_object(queryset)
+        return self.object
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['form'] = CommentForm()
-        context['comments'] = (Comment.objects.filter(
-            post=self.kwargs['post_id']))
+        paginator = CursorPaginator(
+            Comment.objects.for_post(self.object.pk),
+            const.COMMENTS_AT_PAGE,
+            ordering=('created_at', 'pk'))
+        try:
+            context['comments'] = paginator.page(
+                self.request.GET.get('comments_cursor', ''))
+        except InvalidPage:
+            raise Http404
         return context
 
     def test_func(self):
         object = self.get_object()
-        return (object.author == self.request.user
+        return (object.author_id == self.request.user.pk
                 or (object.is_published and object.category.is_published))
 
     def handle_no_permission(self):
         raise Http404
 
 
-class PostUpdateView(PostSuccessURLMixin, OnlyAuthorMixin, UpdateView):
+class PostUpdateView(
+        ImageUploadMixin,
+        PinToPrimaryMixin,
+        PostSuccessURLMixin,
+        OnlyAuthorMixin,
+        UpdateView):
 
     pk_url_kwarg = 'post_id'
     model = Post
@@ -95,8 +145,8 @@ class IndexListView(PostsListView):
     template_name = 'blog/index.html'
 
     def get_queryset(self):
-        qs = super().get_queryset()
-        return qs_filter_list_view(qs, category__is_published=True)
+        return super().get_queryset().published().filter(
+            category__is_published=True)
 
 
 class CategoryListView(PostsListView):
@@ -112,9 +162,7 @@ class CategoryListView(PostsListView):
         return context
 
     def get_queryset(self):
-        qs = super().get_queryset()
-        return qs_filter_list_view(
-            qs,
+        return super().get_queryset().published().filter(
             category__slug=self.kwargs['category_slug'])
 
 
@@ -130,35 +178,72 @@ class ProfileListView(PostsListView):
             username=self.kwargs['username'])
         return context
 
+    def is_owner(self):
+        return self.request.user.username == self.kwargs['username']
+
+    def get_count_cache_key(self):
+        key = super().get_count_cache_key()
+        return f'{key}:owner' if self.is_owner() else key
+
     def get_queryset(self):
-        qs = super().get_queryset()
-        if self.request.user.username == self.kwargs['username']:
-            return annotate_comment_count(
-                qs.filter(
-                    author__username=self.kwargs['username']))
-        return qs_filter_list_view(
-            qs,
-            category__is_published=True,
+        qs = super().get_queryset().filter(
             author__username=self.kwargs['username'])
+        if self.is_owner():
+            return qs
+        return qs.published().filter(category__is_published=True)
+
+
+class PostSearchView(ListView):
+
+    model = Post
+    paginate_by = const.POSTS_AT_PAGE
+    template_name = 'blog/search.html'
+    read_from_replica = True
+
+    def get_search_query(self):
+        return self.request.GET.get('q', '').strip()
+
+    def get_queryset(self):
+        return Post.objects.feed().published().filter(
+            category__is_published=True
+        ).search(self.get_search_query())
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        for post in context['page_obj']:
+            post.title_highlight = render_highlight(post.title_highlight)
+            post.text_snippet = render_highlight(post.text_snippet)
+        context['query'] = self.get_search_query()
+        context['page_query'] = urlencode({'q': context['query']}) + '&'
+        return context
 
 
-class CommentCreateView(PostSuccessURLMixin, LoginRequiredMixin, CreateView):
+class CommentCreateView(
+        PinToPrimaryMixin,
+        PostSuccessURLMixin,
+        LoginRequiredMixin,
+        CreateView):
 
     model = Comment
     form_class = CommentForm
     template_name = 'blog/detail.html'
 
     def dispatch(self, request, *args, **kwargs):
-        self.post_object = get_object_or_404(Post, pk=kwargs['post_id'])
+        if not Post.objects.filter(pk=kwargs['post_id']).exists():
+            raise Http404
         return super().dispatch(request, *args, **kwargs)
 
     def form_valid(self, form):
         form.instance.author = self.request.user
-        form.instance.post = self.post_object
+        form.instance.post_id = self.kwargs['post_id']
         return super().form_valid(form)
 
 
-class CommentUpdateView(PostSuccessURLMixin, OnlyAuthorMixin, UpdateView):
+class CommentUpdateView(
+        PinToPrimaryMixin,
+        PostSuccessURLMixin,
+        OnlyAuthorMixin,
+        UpdateView):
 
     model = Comment
     form_class = CommentForm
@@ -170,6 +255,7 @@ class CommentUpdateView(PostSuccessURLMixin, OnlyAuthorMixin, UpdateView):
 
 
 class ProfileUpdateView(
+        PinToPrimaryMixin,
         ProfileSuccessURLMixin,
         LoginRequiredMixin,
         UpdateView):
@@ -182,7 +268,12 @@ class ProfileUpdateView(
         return self.request.user
 
 
-class CommentDeleteView(PostSuccessURLMixin, OnlyAuthorMixin, DeleteView):
+class CommentDeleteView(
+        PinToPrimaryMixin,
+        PostSuccessURLMixin,
+        OnlyAuthorMixin,
+        DeferTextOnDeleteMixin,
+        DeleteView):
 
     model = Comment
     template_name = 'blog/comment.html'
@@ -191,7 +282,12 @@ class CommentDeleteView(PostSuccessURLMixin, OnlyAuthorMixin, DeleteView):
         raise Http404
 
 
-class PostDeleteView(ProfileSuccessURLMixin, OnlyAuthorMixin, DeleteView):
+class PostDeleteView(
+        PinToPrimaryMixin,
+        ProfileSuccessURLMixin,
+        OnlyAuthorMixin,
+        DeferTextOnDeleteMixin,
+        DeleteView):
 
     pk_url_kwarg = 'post_id'
     model = Post
@@ -0,0 +1,253 @@
+"""
+Django settings for blogicum project, shared by every environment.
+
+Environment specific settings live in dev.py and prod.py; the package
+picks one of them by the BLOGICUM_ENV environment variable.
+
+Generated by 'django-admin startproject' using Django 5.0.3.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/5.0/topics/settings/
+
+For the full list of settings and their values, see
+https://docs.djangoproject.com/en/5.0/ref/settings/
+"""
+
+import os
+from pathlib import Path
+
+# Build paths inside the project like this: BASE_DIR / 'subdir'.
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+
+def env_bool(name, default=False):
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.lower() in ('1', 'true', 'yes', 'on')
+
+
+def env_list(name, default=()):
+    value = os.environ.get(name)
+    if not value:
+        return list(default)
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+# Quick-start development settings - unsuitable for production
+# See https://docs.djangoproject.com/en/5.0/howto/deployment/checklist/
+
+# SECURITY WARNING: keep the secret key used in production secret!
+SECRET_KEY = os.environ.get(
+    'DJANGO_SECRET_KEY',
+    'django-insecure-hd(zoyzs^(m6s-%h_ul@l#3^0b35!$3(lx+*+1i429334%jpo-')
+
+# SECURITY WARNING: don't run with debug turned on in production!
+DEBUG = False
+
+ALLOWED_HOSTS = env_list('DJANGO_ALLOWED_HOSTS', ['127.0.0.1', 'localhost'])
+
+
+# Application definition
+
+INSTALLED_APPS = [
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+    'blog.apps.BlogConfig',
+    'pages.apps.PagesConfig',
+    'core.apps.CoreConfig',
+    'django_bootstrap5',
+]
+
+MIDDLEWARE = [
+    'core.middleware.InstrumentationMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.ReplicaRoutingMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+ROOT_URLCONF = 'blogicum.urls'
+
+# AUTH_USER_MODEL = 'users.User'
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [BASE_DIR / 'templates'],
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+            ],
+        },
+    },
+]
+
+TEMPLATES_DIR = BASE_DIR / 'templates'
+
+WSGI_APPLICATION = 'blogicum.wsgi.application'
+
+
+# Database
+# https://docs.djangoproject.com/en/5.0/ref/settings/#databases
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ.get('BLOGICUM_DB_PATH', BASE_DIR / 'db.sqlite3'),
+    }
+}
+
+# Реплики только для чтения: пути к файлам SQLite через запятую.
+DATABASE_REPLICAS = []
+for number, path in enumerate(env_list('BLOGICUM_DB_REPLICAS')):
+    alias = f'replica{number}'
+    DATABASES[alias] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': path,
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['core.db.PrimaryReplicaRouter']
+# Сколько секунд после записи клиент читает только с основной базы.
+REPLICA_PIN_SECONDS = int(os.environ.get('BLOGICUM_REPLICA_PIN_SECONDS', 5))
+
+# Метрики запросов (core.middleware.InstrumentationMiddleware): сколько
+# последних замеров хранить на представление и бюджеты SQL-запросов.
+# При превышении бюджета 'warn' пишет предупреждение в лог, а 'raise'
+# завершает запрос ошибкой — так в тестах ловятся N+1.
+INSTRUMENTATION_WINDOW = 1000
+QUERY_BUDGET_ACTION = os.environ.get('BLOGICUM_QUERY_BUDGET_ACTION', 'warn')
+QUERY_BUDGETS = {
+    'blog:index': 8,
+    'blog:category_posts': 8,
+    'blog:profile': 8,
+    'blog:post_detail': 8,
+    'blog:search': 8,
+    'blog:add_comment': 8,
+    'blog:edit_comment': 8,
+    'blog:delete_comment': 10,
+    'blog:create_post': 12,
+    'blog:edit_post': 12,
+    'blog:delete_post': 12,
+    'blog:edit_profile': 6,
+    'pages:about': 4,
+    'pages:rules': 4,
+}
+
+# Общий для всех воркеров файл SQLite со счётчиками для /metrics/, как
+# часто (в секундах) процесс сбрасывает в него свои счётчики и сколько
+# ждёт блокировки файла при сбросе.
+METRICS_DB_PATH = os.environ.get(
+    'BLOGICUM_METRICS_PATH', str(BASE_DIR / 'metrics.sqlite3'))
+METRICS_FLUSH_INTERVAL = 10
+METRICS_FLUSH_TIMEOUT = 0.1
+
+# Выполняются для каждого нового соединения с SQLite (core.db).
+# WAL позволяет читать во время записи, а busy_timeout заставляет писателей
+# ждать освобождения блокировки вместо ошибки "database is locked".
+SQLITE_PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'mmap_size': int(os.environ.get('BLOGICUM_SQLITE_MMAP_SIZE', 256 * 2**20)),
+    'cache_size': int(os.environ.get('BLOGICUM_SQLITE_CACHE_SIZE', -64000)),
+    'busy_timeout': int(os.environ.get('BLOGICUM_SQLITE_BUSY_TIMEOUT', 5000)),
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+# LocMem подходит для разработки и тестов, но у каждого процесса он свой;
+# при нескольких воркерах нужен общий кэш: file или db (таблицу создаёт
+# manage.py createcachetable).
+
+CACHE_BACKENDS = {
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', 'blogicum'),
+    'file': ('django.core.cache.backends.filebased.FileBasedCache', '/var/tmp/blogicum-cache'),
+    'db': ('django.core.cache.backends.db.DatabaseCache', 'blogicum_cache'),
+    'dummy': ('django.core.cache.backends.dummy.DummyCache', ''),
+}
+
+
+def build_caches(default_backend):
+    backend, location = CACHE_BACKENDS[
+        os.environ.get('BLOGICUM_CACHE', default_backend)]
+    return {
+        'default': {
+            'BACKEND': backend,
+            'LOCATION': os.environ.get('BLOGICUM_CACHE_LOCATION', location),
+            'KEY_PREFIX': 'blogicum',
+            'TIMEOUT': 300,
+            'OPTIONS': {
+                'MAX_ENTRIES': int(
+                    os.environ.get('BLOGICUM_CACHE_MAX_ENTRIES', 10000)),
+            },
+        },
+    }
+
+
+CACHES = build_caches('locmem')
+
+
+# Password validation
+# https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+LOGIN_REDIRECT_URL = 'blog:index'
+
+# Internationalization
+# https://docs.djangoproject.com/en/5.0/topics/i18n/
+
+LANGUAGE_CODE = 'ru-RU'
+
+TIME_ZONE = 'UTC'
+
+USE_I18N = True
+
+USE_TZ = True
+
+
+# Static files (CSS, JavaScript, Images)
+# https://docs.djangoproject.com/en/5.0/howto/static-files/
+STATICFILES_DIRS = [
+    BASE_DIR / 'static',
+]
+STATIC_URL = 'static/'
+
+MEDIA_ROOT = BASE_DIR / 'media'
+
+EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
+# Default primary key field type
+# https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
+
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+CSRF_FAILURE_VIEW = 'pages.views.csrf_failure'
@@ -0,0 +1,34 @@
+import os
+from copy import deepcopy
+
+from .base import *  # noqa: F401,F403
+from .base import BASE_DIR, DATABASES, TEMPLATES, build_caches
+
+DEBUG = False
+
+SECRET_KEY = os.environ['DJANGO_SECRET_KEY']
+
+DATABASES = deepcopy(DATABASES)
+DATABASES['default']['CONN_MAX_AGE'] = int(
+    os.environ.get('DJANGO_CONN_MAX_AGE', 600))
+
+CACHES = build_caches('file')
+
+# Файл метрик общий для всех воркеров и не должен лежать в каталоге кода.
+METRICS_DB_PATH = os.environ.get(
+    'BLOGICUM_METRICS_PATH', '/var/tmp/blogicum-metrics.sqlite3')
+
+# Шаблоны загружаются через кэширующий загрузчик и компилируются при
+# старте веб-сервера, см. core.templates.warm_up_templates_for_server.
+TEMPLATES = deepcopy(TEMPLATES)
+TEMPLATES[0]['APP_DIRS'] = False
+TEMPLATES[0]['OPTIONS']['loaders'] = [
+    ('django.template.loaders.cached.Loader', [
+        'django.template.loaders.filesystem.Loader',
+        'django.template.loaders.app_directories.Loader',
+    ]),
+]
+WARM_UP_TEMPLATES = True
+
+STATIC_ROOT = os.environ.get('DJANGO_STATIC_ROOT', BASE_DIR / 'static_root')
+STATICFILES_STORAGE = 'core.storage.CompressedManifestStaticFilesStorage'
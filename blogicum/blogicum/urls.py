@@ -34,6 +34,7 @@ urlpatterns = [
          ),
          name='registration'),
     path('pages/', include('pages.urls', namespace='pages')),
+    path('', include('core.urls', namespace='core')),
     path('', include('blog.urls', namespace='blog')),
 
 ]
@@ -42,7 +43,7 @@ handler404 = 'pages.views.page_not_found'
 handler500 = 'pages.views.e_handler500'
 
 
-if settings.DEBUG:
+if 'debug_toolbar' in settings.INSTALLED_APPS:
     import debug_toolbar
     # Добавить к списку urlpatterns список адресов из приложения debug_toolbar:
     urlpatterns += (path('__debug__/', include(debug_toolbar.urls)),)
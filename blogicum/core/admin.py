@@ -1,3 +1,24 @@
-# from django.contrib import admin
+from django.contrib import admin
 
-# Register your models here.
+from .models import Job
+
+
+class JobAdmin(admin.ModelAdmin):
+    list_display = (
+        'task',
+        'status',
+        'attempts',
+        'run_after',
+        'locked_at',
+        'created_at',
+    )
+    list_filter = (
+        'status',
+        'task',
+    )
+    readonly_fields = (
+        'last_error',
+    )
+
+
+admin.site.register(Job, JobAdmin)
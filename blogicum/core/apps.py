@@ -1,6 +1,14 @@
 from django.apps import AppConfig
+from django.core.signals import request_finished
+from django.db.backends.signals import connection_created
 
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from core.db import configure_sqlite
+        from core.metrics import maybe_flush
+        connection_created.connect(configure_sqlite)
+        request_finished.connect(maybe_flush)
@@ -0,0 +1,31 @@
+import itertools
+
+from django.db import connections, transaction
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def insert_rows(model, field_names, rows, batch_size, using='default'):
+    # Вставка готовых значений через executemany: без построчной подготовки
+    # полей, как в bulk_create, и без auto_now_add, который перезаписал бы
+    # перенесённые даты. Каждая порция — отдельная транзакция.
+    connection = connections[using]
+    opts = model._meta
+    columns = [opts.get_field(name).column for name in field_names]
+    sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+        connection.ops.quote_name(opts.db_table),
+        ', '.join(map(connection.ops.quote_name, columns)),
+        ', '.join(['%s'] * len(columns)))
+    inserted = 0
+    for batch in batched(rows, batch_size):
+        with transaction.atomic(using=using), connection.cursor() as cursor:
+            cursor.executemany(sql, batch)
+        inserted += len(batch)
+    return inserted
@@ -0,0 +1,19 @@
+TASK_NAME_LEN = 256
+JOB_MAX_ATTEMPTS = 5
+# Задержка перед повтором задачи: JOB_RETRY_DELAY * 2 ** (попытка - 1) с.
+JOB_RETRY_DELAY = 10
+JOB_BATCH_SIZE = 20
+JOB_POLL_INTERVAL = 1
+# Через сколько секунд задача в статусе «Выполняется» считается брошенной
+# упавшим обработчиком и снова забирается из очереди.
+JOB_LEASE_TIMEOUT = 60 * 10
+PRIMARY_PIN_COOKIE = 'primary_pin'
+# Приложения, которые всегда читаются с основной базы: сессия и пользователь
+# должны быть видны сразу после входа, задачи — сразу после постановки.
+PRIMARY_ONLY_APPS = frozenset({'auth', 'sessions', 'core'})
+# Границы корзин гистограмм для /metrics/.
+METRICS_DURATION_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+METRICS_QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100)
+# Ожидание блокировки файла метрик при чтении /metrics/, в секундах.
+METRICS_READ_TIMEOUT = 5
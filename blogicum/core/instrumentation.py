@@ -0,0 +1,100 @@
+import logging
+import time
+from collections import defaultdict, deque
+
+from django.conf import settings
+
+logger = logging.getLogger('core.instrumentation')
+
+UNRESOLVED_VIEW = '<unresolved>'
+PERCENTILES = (50, 95, 99)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class RequestMetrics:
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.queries = 0
+        self.sql_time = 0.0
+        self.template_time = 0.0
+        self.total_time = None
+        self.template_started_at = None
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        started_at = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_time += time.perf_counter() - started_at
+            self.queries += 1
+
+    def template_started(self):
+        self.template_started_at = time.perf_counter()
+
+    def template_finished(self, response):
+        if self.template_started_at is not None:
+            self.template_time += (
+                time.perf_counter() - self.template_started_at)
+
+    def finish(self):
+        self.total_time = time.perf_counter() - self.started_at
+
+    def as_dict(self):
+        return {
+            'queries': self.queries,
+            'sql_ms': self.sql_time * 1000,
+            'template_ms': self.template_time * 1000,
+            'total_ms': self.total_time * 1000,
+        }
+
+    def server_timing(self):
+        return ', '.join([
+            f'db;dur={self.sql_time * 1000:.1f};desc="{self.queries} SQL"',
+            f'tpl;dur={self.template_time * 1000:.1f}',
+            f'total;dur={self.total_time * 1000:.1f}',
+        ])
+
+
+# Последние значения метрик по каждому представлению в этом процессе.
+samples = defaultdict(dict)
+
+
+def record(view_name, metrics):
+    view_samples = samples[view_name]
+    for name, value in metrics.as_dict().items():
+        if name not in view_samples:
+            view_samples[name] = deque(
+                maxlen=settings.INSTRUMENTATION_WINDOW)
+        view_samples[name].append(value)
+
+
+def percentile(values, percent):
+    values = sorted(values)
+    index = min(len(values) - 1, round(percent / 100 * (len(values) - 1)))
+    return values[index]
+
+
+def get_percentiles(view_name):
+    return {
+        name: {
+            f'p{percent}': percentile(values, percent)
+            for percent in PERCENTILES
+        }
+        for name, values in list(samples[view_name].items())
+        if values
+    }
+
+
+def check_query_budget(view_name, queries):
+    budget = settings.QUERY_BUDGETS.get(view_name)
+    if budget is None or queries <= budget:
+        return
+    message = (
+        f'{view_name}: {queries} SQL-запросов при бюджете {budget}')
+    if settings.QUERY_BUDGET_ACTION == 'raise':
+        raise QueryBudgetExceeded(message)
+    logger.warning(message)
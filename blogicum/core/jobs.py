@@ -0,0 +1,70 @@
+import traceback
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from core.models import Job
+import core.constants as const
+
+
+def enqueue(task, **payload):
+    return Job.objects.create(task=task, payload=payload)
+
+
+def enqueue_many(task, payloads):
+    return Job.objects.bulk_create(
+        Job(task=task, payload=payload) for payload in payloads)
+
+
+def enqueue_on_commit(task, **payload):
+    transaction.on_commit(lambda: enqueue(task, **payload))
+
+
+def fail_abandoned_jobs(stale):
+    Job.objects.filter(
+        stale, attempts__gte=F('max_attempts'),
+    ).update(
+        status=Job.Status.FAILED,
+        last_error='Обработчик не завершил задачу за отведённое время.')
+
+
+def claim_jobs(limit=const.JOB_BATCH_SIZE):
+    now = timezone.now()
+    stale = Q(
+        status=Job.Status.RUNNING,
+        locked_at__lt=now - timedelta(seconds=const.JOB_LEASE_TIMEOUT))
+    fail_abandoned_jobs(stale)
+    candidates = Job.objects.filter(
+        Q(status=Job.Status.PENDING, run_after__lte=now) | stale,
+    ).values_list('pk', 'status', 'locked_at')[:limit]
+    # Задачу забирает тот обработчик, чей UPDATE сменил статус первым.
+    return [
+        job_id for job_id, status, locked_at in list(candidates)
+        if Job.objects.filter(
+            pk=job_id, status=status, locked_at=locked_at,
+        ).update(
+            status=Job.Status.RUNNING,
+            locked_at=now,
+            attempts=F('attempts') + 1)
+    ]
+
+
+def run_job(job_id):
+    job = Job.objects.get(pk=job_id)
+    try:
+        import_string(job.task)(**job.payload)
+    except Exception:
+        job.last_error = traceback.format_exc()
+        if job.attempts >= job.max_attempts:
+            job.status = Job.Status.FAILED
+        else:
+            job.status = Job.Status.PENDING
+            job.run_after = timezone.now() + timedelta(
+                seconds=const.JOB_RETRY_DELAY * 2 ** (job.attempts - 1))
+    else:
+        job.status = Job.Status.DONE
+    job.save(update_fields=('status', 'run_after', 'last_error'))
+    return job.status
@@ -0,0 +1,53 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from core.jobs import claim_jobs, run_job
+import core.constants as const
+
+
+class Command(BaseCommand):
+    help = 'Выполняет фоновые задачи из очереди.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes',
+            type=int,
+            default=os.cpu_count(),
+            help='Число процессов; 0 — выполнять задачи в этом процессе.')
+        parser.add_argument(
+            '--batch',
+            type=int,
+            default=const.JOB_BATCH_SIZE,
+            help='Сколько задач забирать из очереди за раз.')
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Выполнить готовые задачи и завершиться.')
+
+    def handle(self, *args, **options):
+        if options['processes'] == 0:
+            self.work(map, options)
+            return
+        connections.close_all()
+        with ProcessPoolExecutor(
+                max_workers=options['processes'],
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=django.setup) as pool:
+            self.work(pool.map, options)
+
+    def work(self, map_jobs, options):
+        while True:
+            job_ids = claim_jobs(options['batch'])
+            if job_ids:
+                for job_id, status in zip(job_ids, map_jobs(run_job, job_ids)):
+                    self.stdout.write(f'{job_id}: {status}')
+            elif options['once']:
+                return
+            else:
+                time.sleep(const.JOB_POLL_INTERVAL)
@@ -0,0 +1,16 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.templates import warm_up_templates
+
+
+class Command(BaseCommand):
+    help = 'Компилирует все шаблоны проекта и сообщает об ошибках.'
+
+    def handle(self, *args, **options):
+        started_at = time.perf_counter()
+        compiled = warm_up_templates()
+        self.stdout.write(self.style.SUCCESS(
+            f'Скомпилировано шаблонов: {len(compiled)} за '
+            f'{time.perf_counter() - started_at:.3f} с'))
@@ -0,0 +1,182 @@
+import logging
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+
+import core.constants as const
+
+logger = logging.getLogger(__name__)
+
+METRIC_FAMILIES = {
+    'blogicum_request_duration_seconds': (
+        'histogram', 'Время обработки запроса по имени URL.'),
+    'blogicum_db_queries': (
+        'histogram', 'Число SQL-запросов на запрос по имени URL.'),
+    'blogicum_db_query_seconds_total': (
+        'counter', 'Суммарное время SQL-запросов по имени URL.'),
+    'blogicum_cache_requests_total': (
+        'counter', 'Обращения к кэшу блога: попадания и промахи.'),
+    'blogicum_image_bytes_served_total': (
+        'counter', 'Байты изображений, отданные приложением.'),
+}
+HISTOGRAM_SUFFIXES = ('_bucket', '_sum', '_count')
+
+CREATE_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS metrics (
+        name TEXT NOT NULL,
+        labels TEXT NOT NULL,
+        value REAL NOT NULL,
+        PRIMARY KEY (name, labels)
+    )
+"""
+UPSERT_SQL = """
+    INSERT INTO metrics (name, labels, value) VALUES (?, ?, ?)
+    ON CONFLICT (name, labels) DO UPDATE SET value = value + excluded.value
+"""
+
+# Счётчики процесса копятся в словаре под блокировкой и раз в
+# METRICS_FLUSH_INTERVAL секунд прибавляются к общему файлу SQLite, из
+# которого их читают все воркеры. Сброс идёт по сигналу request_finished,
+# то есть уже после отправки ответа.
+counters = defaultdict(float)
+lock = threading.Lock()
+last_flush = time.monotonic()
+
+
+def format_labels(labels):
+    # Граница корзины le идёт последней, чтобы корзины одной гистограммы
+    # стояли рядом при сортировке.
+    return ','.join(
+        f'{name}="{value}"' for name, value in sorted(
+            labels.items(), key=lambda item: (item[0] == 'le', item[0])))
+
+
+def sample_sort_key(sample):
+    name, labels, _ = sample
+    if 'le="' not in labels:
+        return name, labels, 0.0
+    prefix, _, bucket = labels.rpartition('le="')
+    return name, prefix, float(bucket.rstrip('"'))
+
+
+def inc(name, value=1, **labels):
+    key = name, format_labels(labels)
+    with lock:
+        counters[key] += value
+
+
+def observe(name, value, buckets, **labels):
+    for bucket in buckets:
+        if value <= bucket:
+            inc(f'{name}_bucket', le=bucket, **labels)
+    inc(f'{name}_bucket', le='+Inf', **labels)
+    inc(f'{name}_sum', value, **labels)
+    inc(f'{name}_count', **labels)
+
+
+def record_request(view_name, request_metrics, response):
+    observe(
+        'blogicum_request_duration_seconds',
+        request_metrics.total_time,
+        const.METRICS_DURATION_BUCKETS,
+        view=view_name)
+    observe(
+        'blogicum_db_queries',
+        request_metrics.queries,
+        const.METRICS_QUERY_BUCKETS,
+        view=view_name)
+    inc(
+        'blogicum_db_query_seconds_total',
+        request_metrics.sql_time,
+        view=view_name)
+    if response.get('Content-Type', '').startswith('image/'):
+        inc(
+            'blogicum_image_bytes_served_total',
+            int(response.get('Content-Length') or 0))
+
+
+def record_cache(cache_name, hit):
+    inc(
+        'blogicum_cache_requests_total',
+        cache=cache_name,
+        result='hit' if hit else 'miss')
+
+
+def connect(timeout=const.METRICS_READ_TIMEOUT):
+    connection = sqlite3.connect(settings.METRICS_DB_PATH, timeout=timeout)
+    connection.execute('PRAGMA journal_mode = wal')
+    connection.execute(CREATE_TABLE_SQL)
+    return connection
+
+
+def flush(timeout=const.METRICS_READ_TIMEOUT):
+    global last_flush
+    with lock:
+        last_flush = time.monotonic()
+        pending = dict(counters)
+        counters.clear()
+    if not pending:
+        return
+    rows = [
+        (name, labels, value) for (name, labels), value in pending.items()]
+    try:
+        connection = connect(timeout)
+        try:
+            with connection:
+                connection.executemany(UPSERT_SQL, rows)
+        finally:
+            connection.close()
+    except sqlite3.OperationalError:
+        # Файл занят другим воркером: счётчики вернутся в словарь и уйдут
+        # со следующим сбросом.
+        with lock:
+            for key, value in pending.items():
+                counters[key] += value
+        raise
+
+
+def maybe_flush(**kwargs):
+    if time.monotonic() - last_flush < settings.METRICS_FLUSH_INTERVAL:
+        return
+    try:
+        flush(settings.METRICS_FLUSH_TIMEOUT)
+    except sqlite3.OperationalError as error:
+        logger.warning('Не удалось сбросить метрики: %s', error)
+
+
+def collect():
+    flush()
+    connection = connect()
+    try:
+        return sorted(
+            connection.execute('SELECT name, labels, value FROM metrics'),
+            key=sample_sort_key)
+    finally:
+        connection.close()
+
+
+def get_family(name):
+    for suffix in HISTOGRAM_SUFFIXES:
+        base = name[:-len(suffix)]
+        if name.endswith(suffix) and base in METRIC_FAMILIES:
+            return base
+    return name
+
+
+def render_prometheus(rows):
+    families = defaultdict(list)
+    for name, labels, value in rows:
+        families[get_family(name)].append((name, labels, value))
+    lines = []
+    for family, samples in families.items():
+        metric_type, help_text = METRIC_FAMILIES.get(
+            family, ('untyped', ''))
+        lines.append(f'# HELP {family} {help_text}')
+        lines.append(f'# TYPE {family} {metric_type}')
+        for name, labels, value in samples:
+            labels = f'{{{labels}}}' if labels else ''
+            lines.append(f'{name}{labels} {value!r}')
+    return '\n'.join(lines) + '\n'
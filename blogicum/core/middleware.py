@@ -0,0 +1,74 @@
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from core.db import replica_reads
+from core.instrumentation import (
+    UNRESOLVED_VIEW,
+    RequestMetrics,
+    check_query_budget,
+    record)
+from core.metrics import record_request
+import core.constants as const
+
+
+# Должен стоять первым в MIDDLEWARE, чтобы общее время включало остальные
+# промежуточные обработчики, а замер шаблона начинался прямо перед рендером.
+class InstrumentationMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.metrics = metrics = RequestMetrics()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(
+                    connection.execute_wrapper(metrics.execute_wrapper))
+            response = self.get_response(request)
+        metrics.finish()
+        view_name = getattr(
+            request.resolver_match, 'view_name', None) or UNRESOLVED_VIEW
+        record(view_name, metrics)
+        record_request(view_name, metrics, response)
+        response['Server-Timing'] = metrics.server_timing()
+        check_query_budget(view_name, metrics.queries)
+        return response
+
+    def process_template_response(self, request, response):
+        request.metrics.template_started()
+        response.add_post_render_callback(request.metrics.template_finished)
+        return response
+
+
+# Направляет чтение на реплики для представлений с read_from_replica.
+# После записи через pin_to_primary() клиент на REPLICA_PIN_SECONDS
+# закрепляется за основной базой, чтобы видеть свои изменения.
+class ReplicaRoutingMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = replica_reads.set(False)
+        try:
+            response = self.get_response(request)
+        finally:
+            replica_reads.reset(token)
+        if getattr(request, 'pin_to_primary', False):
+            response.set_cookie(
+                const.PRIMARY_PIN_COOKIE,
+                '1',
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite='Lax')
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'view_class', None)
+        if (
+                getattr(view_class, 'read_from_replica', False)
+                and request.method in ('GET', 'HEAD')
+                and const.PRIMARY_PIN_COOKIE not in request.COOKIES):
+            replica_reads.set(True)
@@ -1,4 +1,7 @@
 from django.db import models
+from django.utils import timezone
+
+import core.constants as const
 
 
 class PublishedModel(models.Model):
@@ -20,3 +23,59 @@ class CreatedModel(models.Model):
 
     class Meta:
         abstract = True
+
+
+class Job(CreatedModel):
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'В очереди'
+        RUNNING = 'running', 'Выполняется'
+        DONE = 'done', 'Выполнена'
+        FAILED = 'failed', 'Ошибка'
+
+    task = models.CharField(
+        verbose_name='Задача',
+        max_length=const.TASK_NAME_LEN,)
+
+    payload = models.JSONField(
+        verbose_name='Параметры',
+        default=dict,)
+
+    status = models.CharField(
+        verbose_name='Статус',
+        max_length=16,
+        choices=Status.choices,
+        default=Status.PENDING,)
+
+    attempts = models.PositiveSmallIntegerField(
+        verbose_name='Попыток',
+        default=0,)
+
+    max_attempts = models.PositiveSmallIntegerField(
+        verbose_name='Максимум попыток',
+        default=const.JOB_MAX_ATTEMPTS,)
+
+    run_after = models.DateTimeField(
+        verbose_name='Выполнить после',
+        default=timezone.now,)
+
+    locked_at = models.DateTimeField(
+        verbose_name='Взята в работу',
+        null=True,
+        blank=True,)
+
+    last_error = models.TextField(
+        verbose_name='Последняя ошибка',
+        blank=True,)
+
+    class Meta:
+        verbose_name = 'фоновая задача'
+        verbose_name_plural = 'Фоновые задачи'
+        ordering = ('run_after',)
+        indexes = (
+            models.Index(
+                fields=('status', 'run_after'),
+                name='job_queue_idx'),
+        )
+
+    def __str__(self):
+        return f'{self.task} ({self.get_status_display()})'
@@ -0,0 +1,27 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.template import engines
+
+
+def find_template_names(engine):
+    for template_dir in engine.engine.dirs:
+        for path in sorted(Path(template_dir).rglob('*.html')):
+            yield path.relative_to(template_dir).as_posix()
+
+
+def warm_up_templates():
+    compiled = []
+    for engine in engines.all():
+        for name in find_template_names(engine):
+            engine.get_template(name)
+            compiled.append(name)
+    return compiled
+
+
+def warm_up_templates_for_server():
+    # Вызывается из точек входа WSGI/ASGI: migrate, shell и run_jobs
+    # шаблоны не отрисовывают, и компилировать их там незачем.
+    if not getattr(settings, 'WARM_UP_TEMPLATES', False):
+        return []
+    return warm_up_templates()
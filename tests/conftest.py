@@ -1,5 +1,7 @@
+import importlib
 import os
 import re
+import sys
 import time
 from http import HTTPStatus
 from inspect import getsource
@@ -19,6 +21,7 @@ from typing import (
 import pytest
 from django.apps import apps
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.db.models import Model, Field
 from django.forms import BaseForm
 from django.http import HttpResponse
@@ -41,6 +44,27 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(autouse=True)
+def fail_on_query_budget():
+    with override_settings(QUERY_BUDGET_ACTION="raise"):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def metrics_db(tmp_path):
+    from core.metrics import counters
+
+    counters.clear()
+    with override_settings(METRICS_DB_PATH=str(tmp_path / "metrics.sqlite3")):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
@@ -101,6 +125,13 @@ def mixer():
     return _mixer
 
 
+@pytest.fixture
+def prod_settings(monkeypatch):
+    monkeypatch.setenv("DJANGO_SECRET_KEY", "test-secret-key")
+    sys.modules.pop("blogicum.settings.prod", None)
+    return importlib.import_module("blogicum.settings.prod")
+
+
 @pytest.fixture
 def user(mixer):
     User = get_user_model()
@@ -363,6 +394,7 @@ def cleanup(request):
                     filename.endswith(".jpg")
                     or filename.endswith(".gif")
                     or filename.endswith(".png")
+                    or filename.endswith(".webp")
             ):
                 file_path = os.path.join(root, filename)
                 if os.path.getmtime(file_path) >= start_time:
@@ -0,0 +1,184 @@
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+CARD_BODY_TEMPLATE = "includes/post_card_body.html"
+
+
+def rendered_templates(client, url):
+    response = client.get(url)
+    return response, [template.name for template in response.templates]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_post_card_fragment_is_cached(
+        user_client, post_with_published_location):
+    cache.clear()
+    _, templates = rendered_templates(user_client, "/")
+    assert CARD_BODY_TEMPLATE in templates
+    _, templates = rendered_templates(user_client, "/")
+    assert CARD_BODY_TEMPLATE not in templates, (
+        "Убедитесь, что карточка поста в ленте берётся из кэша, если пост"
+        " не изменился."
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize(
+    "change", ["post", "category", "location", "author", "comment"])
+def test_post_card_fragment_is_invalidated(
+        change, mixer, user_client, post_with_published_location):
+    post = post_with_published_location
+    cache.clear()
+    rendered_templates(user_client, "/")
+    new_text = "Changed card text"
+    if change == "post":
+        post.title = new_text
+        post.save()
+    elif change == "category":
+        post.category.title = new_text
+        post.category.save()
+    elif change == "location":
+        post.location.name = new_text
+        post.location.save()
+    elif change == "author":
+        post.author.username = new_text.replace(" ", "_")
+        post.author.save()
+        new_text = post.author.username
+    else:
+        mixer.blend("blog.Comment", post=post)
+        new_text = "Комментарии (1)"
+    response, templates = rendered_templates(user_client, "/")
+    assert CARD_BODY_TEMPLATE in templates
+    assert new_text in response.content.decode(), (
+        "Убедитесь, что кэш карточки поста сбрасывается при изменении"
+        " поста, категории, местоположения, автора или числа комментариев."
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize("url", ["/", "/posts/{post_id}/"])
+def test_anonymous_page_is_cached_and_purged(
+        url, client, mixer, post_with_published_location):
+    post = post_with_published_location
+    url = url.format(post_id=post.id)
+    client.get(url)
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url)
+    assert not ctx.captured_queries, (
+        "Убедитесь, что повторный запрос страницы анонимным пользователем"
+        " обслуживается из кэша без обращений к базе данных."
+    )
+    assert post.title in response.content.decode()
+
+    comment = mixer.blend("blog.Comment", post=post)
+    expected = (
+        "Комментарии (1)" if url == "/" else f"comment_{comment.id}")
+    assert expected in client.get(url).content.decode(), (
+        "Убедитесь, что кэш страниц сбрасывается при добавлении комментария."
+    )
+    post.title = "Changed page title"
+    post.save()
+    assert post.title in client.get(url).content.decode(), (
+        "Убедитесь, что кэш страниц сбрасывается при изменении поста."
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_page_cache_ignores_unknown_query_params(
+        client, post_with_published_location):
+    client.get("/?page=1")
+    with CaptureQueriesContext(connection) as ctx:
+        client.get("/?page=1")
+    assert not ctx.captured_queries, (
+        "Убедитесь, что страницы с параметром `page` кэшируются."
+    )
+    client.get("/?utm=1")
+    with CaptureQueriesContext(connection) as ctx:
+        client.get("/?utm=1")
+    assert ctx.captured_queries, (
+        "Убедитесь, что запросы с посторонними параметрами не кэшируются,"
+        " чтобы произвольные строки запроса не засоряли кэш."
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_authenticated_pages_are_not_cached(
+        user_client, post_with_published_location):
+    user_client.get("/")
+    with CaptureQueriesContext(connection) as ctx:
+        user_client.get("/")
+    assert ctx.captured_queries, (
+        "Убедитесь, что страницы авторизованных пользователей не кэшируются."
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_next_pub_date_is_tracked(mixer, user, published_category):
+    from blog.schedule import get_next_pub_date, timeout_until_next_pub_date
+
+    assert get_next_pub_date() is None
+    with CaptureQueriesContext(connection) as ctx:
+        assert timeout_until_next_pub_date(600) == 600
+    assert not ctx.captured_queries, (
+        "Убедитесь, что дата следующей отложенной публикации кэшируется."
+    )
+    pub_date = timezone.now() + timedelta(seconds=30)
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=pub_date)
+    assert get_next_pub_date() == pub_date, (
+        "Убедитесь, что дата следующей отложенной публикации обновляется"
+        " при сохранении поста."
+    )
+    assert 0 < timeout_until_next_pub_date(600) <= 30, (
+        "Убедитесь, что кэш устаревает к моменту публикации отложенного"
+        " поста."
+    )
+
+
+def test_versioned_key_changes_after_bump():
+    from blog.cache import bump_version, get_or_set, versioned_key
+
+    key = versioned_key("posts", "count", "index")
+    assert key.startswith("blog:"), (
+        "Убедитесь, что ключи кэша блога собраны в отдельное пространство"
+        " имён."
+    )
+    assert get_or_set("posts", ("count", "index"), lambda: 1) == 1
+    assert get_or_set("posts", ("count", "index"), lambda: 2) == 1
+    bump_version("posts")
+    assert versioned_key("posts", "count", "index") != key
+    assert get_or_set("posts", ("count", "index"), lambda: 2) == 2, (
+        "Убедитесь, что после смены версии пространства имён старые значения"
+        " в кэше не используются."
+    )
+
+
+@pytest.mark.django_db
+def test_only_author_card_changes_purge_all_pages(client, user):
+    from blog.cache import get_version
+
+    version = get_version("page:all")
+    client.post("/auth/registration/", {
+        "username": "newcomer",
+        "password1": "Pa55-word-for-test",
+        "password2": "Pa55-word-for-test",
+    })
+    user.set_password("An0ther-pa55-word")
+    user.save()
+    user.email = "new@example.com"
+    user.save(update_fields=["email"])
+    assert get_version("page:all") == version, (
+        "Убедитесь, что регистрация, смена пароля и правки профиля, которые"
+        " не видны в карточке поста, не сбрасывают кэш всех страниц."
+    )
+    user.first_name = "Новое имя"
+    user.save()
+    assert get_version("page:all") != version, (
+        "Убедитесь, что смена имени автора сбрасывает кэш страниц."
+    )
@@ -0,0 +1,73 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db(transaction=True)
+def test_comment_count_follows_comments(mixer, post_with_published_location):
+    post = post_with_published_location
+    comments = mixer.cycle(3).blend("blog.Comment", post=post)
+    post.refresh_from_db()
+    assert post.comment_count == 3, (
+        "Убедитесь, что при добавлении комментария счётчик комментариев"
+        " публикации увеличивается."
+    )
+    comments[0].delete()
+    post.refresh_from_db()
+    assert post.comment_count == 2, (
+        "Убедитесь, что при удалении комментария счётчик комментариев"
+        " публикации уменьшается."
+    )
+    post.comment_set.all().delete()
+    post.refresh_from_db()
+    assert post.comment_count == 0, (
+        "Убедитесь, что при массовом удалении комментариев счётчик"
+        " комментариев публикации обновляется."
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_recount_comments_repairs_drift(
+        mixer, post_with_published_location, PostModel):
+    post = post_with_published_location
+    mixer.cycle(2).blend("blog.Comment", post=post)
+    PostModel.objects.filter(pk=post.pk).update(comment_count=42)
+    call_command("recount_comments", stdout=StringIO())
+    post.refresh_from_db()
+    assert post.comment_count == 2, (
+        "Убедитесь, что команда `recount_comments` исправляет расхождения"
+        " в счётчике комментариев."
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_comment_count_follows_moved_comment(
+        mixer, post_with_published_location):
+    post = post_with_published_location
+    other_post = mixer.blend(
+        "blog.Post", author=post.author, category=post.category)
+    comment = mixer.blend("blog.Comment", post=post)
+    comment.post = other_post
+    comment.save()
+    post.refresh_from_db()
+    other_post.refresh_from_db()
+    assert (post.comment_count, other_post.comment_count) == (0, 1), (
+        "Убедитесь, что при переносе комментария к другой публикации"
+        " счётчики комментариев обеих публикаций обновляются."
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_comment_count_never_goes_negative(
+        mixer, post_with_published_location, CommentModel):
+    post = post_with_published_location
+    CommentModel.objects.bulk_create(
+        CommentModel(post=post, author=post.author, text="Комментарий")
+        for _ in range(2))
+    CommentModel.objects.filter(post=post).first().delete()
+    post.refresh_from_db()
+    assert post.comment_count == 0, (
+        "Убедитесь, что удаление комментария не падает, если счётчик"
+        " комментариев меньше их реального числа."
+    )
@@ -0,0 +1,37 @@
+import pytest
+from django.db import connection, connections
+
+pytestmark = pytest.mark.skipif(
+    connection.vendor != "sqlite", reason="Настройки SQLite")
+
+
+def fetch_pragma(conn, name):
+    with conn.cursor() as cursor:
+        cursor.execute(f"PRAGMA {name}")
+        return cursor.fetchone()[0]
+
+
+@pytest.mark.django_db
+def test_sqlite_connection_is_tuned(settings, tmp_path):
+    settings.SQLITE_PRAGMAS = {
+        "journal_mode": "wal",
+        "synchronous": "normal",
+        "busy_timeout": 1234,
+        "cache_size": -2000,
+    }
+    conn = type(connections["default"])(
+        {**connection.settings_dict, "NAME": str(tmp_path / "db.sqlite3")},
+        "default",
+    )
+    try:
+        assert fetch_pragma(conn, "journal_mode") == "wal", (
+            "Убедитесь, что для SQLite включается журнал WAL."
+        )
+        assert fetch_pragma(conn, "synchronous") == 1
+        assert fetch_pragma(conn, "busy_timeout") == 1234, (
+            "Убедитесь, что параметры соединения с SQLite берутся из"
+            " настройки `SQLITE_PRAGMAS`."
+        )
+        assert fetch_pragma(conn, "cache_size") == -2000
+    finally:
+        conn.close()
@@ -0,0 +1,95 @@
+import json
+
+import pytest
+from django.core.management import call_command
+
+
+def snapshot():
+    from django.contrib.auth import get_user_model
+
+    from blog.models import Category, Comment, Location, Post
+
+    return {
+        model._meta.label: list(model.objects.order_by("pk").values())
+        for model in (get_user_model(), Category, Location, Post, Comment)
+    }
+
+
+@pytest.mark.django_db
+def test_export_import_round_trip(tmp_path):
+    from django.contrib.auth import get_user_model
+
+    from blog.models import Category, Location
+
+    call_command(
+        "seed_blog", users=4, categories=2, locations=2, posts=15,
+        comments=60, verbosity=0)
+    before = snapshot()
+    dump = tmp_path / "blog.jsonl"
+    call_command("export_blog", str(dump))
+    lines = dump.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 4 + 2 + 2 + 15 + 60
+    assert json.loads(lines[0])["model"] == "auth.user", (
+        "Убедитесь, что `export_blog` выгружает по одному объекту в строке."
+    )
+    # Порядок строк в выгрузке не должен влиять на загрузку.
+    lines.reverse()
+    lines.append(json.dumps({"model": "sessions.session", "pk": "x"}))
+    dump.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    for model in (get_user_model(), Category, Location):
+        model.objects.all().delete()
+    assert not any(snapshot().values())
+    call_command("import_blog", str(dump), batch_size=7, verbosity=0)
+    assert snapshot() == before, (
+        "Убедитесь, что после `export_blog` и `import_blog` данные, включая"
+        " даты создания и счётчики комментариев, совпадают с исходными."
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_import_is_atomic_and_invalidates_cards(tmp_path):
+    from django.db import IntegrityError
+
+    from blog.cache import get_version
+    from blog.models import Category
+
+    dump = tmp_path / "blog.jsonl"
+    lines = [
+        {"model": "blog.category", "pk": 1, "fields": {
+            "title": "Категория", "description": "Описание",
+            "slug": "category", "is_published": True,
+            "created_at": "2024-01-01T00:00:00Z"}},
+        {"model": "blog.comment", "pk": 1, "fields": {
+            "text": "Комментарий", "post": 404, "author": 404,
+            "created_at": "2024-01-01T00:00:00Z"}},
+    ]
+    dump.write_text(
+        "\n".join(json.dumps(line) for line in lines) + "\n",
+        encoding="utf-8")
+    with pytest.raises(IntegrityError):
+        call_command("import_blog", str(dump), verbosity=0)
+    assert not Category.objects.exists(), (
+        "Убедитесь, что `import_blog` загружает данные в одной транзакции"
+        " и при ошибке не оставляет частично загруженных строк."
+    )
+
+    cards_version = get_version("cards")
+    dump.write_text(json.dumps(lines[0]) + "\n", encoding="utf-8")
+    call_command("import_blog", str(dump), verbosity=0)
+    assert Category.objects.exists()
+    assert get_version("cards") != cards_version, (
+        "Убедитесь, что после `import_blog` сбрасывается кэш карточек"
+        " постов."
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("line", ["[1, 2]", '"blog.post"', "42", "{}"])
+def test_import_rejects_malformed_lines(tmp_path, line):
+    from django.core.management import CommandError
+
+    dump = tmp_path / "blog.jsonl"
+    dump.write_text(line + "\n", encoding="utf-8")
+    with pytest.raises(CommandError, match="blog.jsonl:1"):
+        call_command("import_blog", str(dump), verbosity=0)
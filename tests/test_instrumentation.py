@@ -0,0 +1,43 @@
+import logging
+
+import pytest
+from django.test.utils import override_settings
+
+
+@pytest.mark.django_db
+def test_request_metrics_are_recorded(user_client):
+    from core.instrumentation import get_percentiles
+
+    response = user_client.get("/")
+    server_timing = response.get("Server-Timing", "")
+    for metric in ("db;dur=", "tpl;dur=", "total;dur="):
+        assert metric in server_timing, (
+            "Убедитесь, что ответ содержит заголовок `Server-Timing` со"
+            " временем SQL-запросов, рендеринга шаблона и ответа целиком."
+        )
+    percentiles = get_percentiles("blog:index")
+    assert percentiles["queries"]["p50"] > 0
+    assert percentiles["template_ms"]["p99"] > 0, (
+        "Убедитесь, что время рендеринга шаблона попадает в метрики."
+    )
+    assert percentiles["total_ms"]["p50"] >= percentiles["sql_ms"]["p50"]
+
+
+@pytest.mark.django_db
+def test_query_budget_raises(user_client):
+    from core.instrumentation import QueryBudgetExceeded
+
+    with override_settings(QUERY_BUDGETS={"blog:index": 0}):
+        with pytest.raises(QueryBudgetExceeded):
+            user_client.get("/")
+
+
+@pytest.mark.django_db
+def test_query_budget_warns(user_client, caplog):
+    with override_settings(
+            QUERY_BUDGETS={"blog:index": 0}, QUERY_BUDGET_ACTION="warn"):
+        with caplog.at_level(logging.WARNING, "core.instrumentation"):
+            user_client.get("/")
+    assert "blog:index" in caplog.text, (
+        "Убедитесь, что превышение бюджета SQL-запросов записывается в лог."
+    )
@@ -0,0 +1,87 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from core.jobs import claim_jobs, enqueue
+from core.models import Job
+import core.constants as const
+
+CALLS = []
+
+
+def record_call(value):
+    CALLS.append(value)
+
+
+def always_fail():
+    raise RuntimeError("Task failed")
+
+
+def run_worker():
+    call_command("run_jobs", "--once", "--processes", "0", stdout=StringIO())
+
+
+@pytest.mark.django_db
+def test_job_is_executed():
+    CALLS.clear()
+    job = enqueue("test_jobs.record_call", value=42)
+    run_worker()
+    job.refresh_from_db()
+    assert job.status == Job.Status.DONE, (
+        "Убедитесь, что обработчик очереди выполняет фоновые задачи."
+    )
+    assert CALLS == [42]
+
+
+@pytest.mark.django_db
+def test_failed_job_is_retried_then_marked_failed():
+    job = enqueue("test_jobs.always_fail")
+    run_worker()
+    job.refresh_from_db()
+    assert job.status == Job.Status.PENDING and job.attempts == 1, (
+        "Убедитесь, что задача с ошибкой возвращается в очередь для"
+        " повторной попытки."
+    )
+    assert "Task failed" in job.last_error
+    assert job.run_after > job.created_at
+
+    Job.objects.filter(pk=job.pk).update(
+        run_after=job.created_at, attempts=job.max_attempts - 1)
+    run_worker()
+    job.refresh_from_db()
+    assert job.status == Job.Status.FAILED, (
+        "Убедитесь, что после исчерпания попыток задача помечается как"
+        " завершившаяся с ошибкой."
+    )
+
+
+@pytest.mark.django_db
+def test_abandoned_running_job_is_reclaimed():
+    job = enqueue("test_jobs.record_call", value=1)
+    assert claim_jobs() == [job.pk]
+    assert claim_jobs() == [], (
+        "Убедитесь, что выполняющаяся задача не выдаётся повторно."
+    )
+    Job.objects.filter(pk=job.pk).update(
+        locked_at=timezone.now() - timedelta(
+            seconds=const.JOB_LEASE_TIMEOUT + 1))
+    assert claim_jobs() == [job.pk], (
+        "Убедитесь, что задача, брошенная упавшим обработчиком, снова"
+        " забирается из очереди после истечения аренды."
+    )
+    job.refresh_from_db()
+    assert job.attempts == 2
+
+    Job.objects.filter(pk=job.pk).update(
+        attempts=job.max_attempts,
+        locked_at=timezone.now() - timedelta(
+            seconds=const.JOB_LEASE_TIMEOUT + 1))
+    assert claim_jobs() == []
+    job.refresh_from_db()
+    assert job.status == Job.Status.FAILED, (
+        "Убедитесь, что брошенная задача без оставшихся попыток помечается"
+        " как завершившаяся с ошибкой."
+    )
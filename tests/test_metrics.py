@@ -0,0 +1,107 @@
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+import pytest
+
+
+@pytest.mark.django_db
+def test_metrics_are_staff_only(user_client):
+    response = user_client.get("/metrics/")
+    assert response.status_code == HTTPStatus.FOUND, (
+        "Убедитесь, что страница метрик доступна только сотрудникам."
+    )
+
+
+@pytest.mark.django_db
+def test_metrics_export(admin_client, client, post_with_published_location):
+    client.get("/")
+    client.get("/")
+    response = admin_client.get("/metrics/")
+    assert response.status_code == HTTPStatus.OK
+    assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+    content = response.content.decode("utf-8")
+    for line in (
+        "# TYPE blogicum_request_duration_seconds histogram",
+        'blogicum_request_duration_seconds_count{view="blog:index"} 2.0',
+        'blogicum_db_queries_bucket{view="blog:index",le="+Inf"} 2.0',
+        'blogicum_cache_requests_total{cache="page",result="hit"} 1.0',
+        'blogicum_cache_requests_total{cache="page",result="miss"} 1.0',
+        'blogicum_cache_requests_total{cache="post_card",result="miss"} 1.0',
+    ):
+        assert line in content, (
+            "Убедитесь, что метрики выводятся в текстовом формате Prometheus"
+            f" и содержат строку `{line}`."
+        )
+
+
+@pytest.mark.django_db
+def test_post_card_cache_is_counted(
+        admin_client, user_client, post_with_published_location):
+    user_client.get("/")
+    user_client.get("/")
+    content = admin_client.get("/metrics/").content.decode("utf-8")
+    for result in ("hit", "miss"):
+        line = (
+            f'blogicum_cache_requests_total{{cache="post_card",'
+            f'result="{result}"}} 1.0')
+        assert line in content, (
+            "Убедитесь, что попадания и промахи кэша карточек постов"
+            f" учитываются в метриках: нет строки `{line}`."
+        )
+
+
+def test_metrics_are_aggregated_across_flushes():
+    from core.metrics import collect, flush, inc, render_prometheus
+
+    inc("blogicum_image_bytes_served_total", 100)
+    flush()
+    inc("blogicum_image_bytes_served_total", 50)
+    assert "blogicum_image_bytes_served_total 150.0" in render_prometheus(
+        collect()), (
+        "Убедитесь, что счётчики процессов складываются в общем хранилище."
+    )
+
+
+def test_metrics_flush_does_not_block_on_locked_file(settings):
+    from core.metrics import collect, counters, inc, maybe_flush
+
+    settings.METRICS_FLUSH_INTERVAL = 0
+    settings.METRICS_FLUSH_TIMEOUT = 0.01
+    collect()
+    locker = sqlite3.connect(settings.METRICS_DB_PATH)
+    locker.execute("BEGIN EXCLUSIVE")
+    try:
+        inc("blogicum_image_bytes_served_total", 100)
+        started_at = time.perf_counter()
+        maybe_flush()
+        assert time.perf_counter() - started_at < 1, (
+            "Убедитесь, что сброс метрик не ждёт занятый файл дольше"
+            " METRICS_FLUSH_TIMEOUT."
+        )
+    finally:
+        locker.rollback()
+        locker.close()
+    assert counters, (
+        "Убедитесь, что при занятом файле метрик счётчики не теряются и"
+        " уходят со следующим сбросом."
+    )
+
+
+def test_metrics_counters_are_thread_safe():
+    from core.metrics import collect, flush, inc, render_prometheus
+
+    def work(_):
+        for number in range(1000):
+            inc("blogicum_image_bytes_served_total")
+            if number % 100 == 0:
+                flush()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(work, range(8)))
+    assert "blogicum_image_bytes_served_total 8000.0" in render_prometheus(
+        collect()), (
+        "Убедитесь, что счётчики метрик не теряют приращения при работе"
+        " в нескольких потоках."
+    )
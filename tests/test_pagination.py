@@ -0,0 +1,101 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from conftest import N_PER_PAGE
+
+
+def get_cursor_page(client, url, cursor=""):
+    response = client.get(url, {"cursor": cursor})
+    assert response.status_code == HTTPStatus.OK, (
+        f"Убедитесь, что страница `{url}` с параметром `cursor` загружается"
+        " без ошибок."
+    )
+    return response.context["page_obj"]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_cursor_pagination_walks_feed(
+        client, many_posts_with_published_locations, PostModel):
+    expected_ids = list(
+        PostModel.objects.published().filter(
+            category__is_published=True
+        ).order_by("-pub_date", "-pk").values_list(
+            "pk", flat=True))
+
+    seen_ids = []
+    page = get_cursor_page(client, "/")
+    pages = [page]
+    while page.has_next():
+        seen_ids.extend(post.pk for post in page)
+        page = get_cursor_page(client, "/", page.next_cursor)
+        pages.append(page)
+    seen_ids.extend(post.pk for post in page)
+    assert seen_ids == expected_ids, (
+        "Убедитесь, что при постраничном выводе по курсору посты выводятся"
+        " по порядку, без пропусков и повторов."
+    )
+    assert all(len(page) <= N_PER_PAGE for page in pages)
+    assert not pages[0].has_previous()
+
+    previous = get_cursor_page(client, "/", pages[-1].previous_cursor)
+    assert [post.pk for post in previous] == [post.pk for post in pages[-2]], (
+        "Убедитесь, что ссылка на предыдущую страницу курсора ведёт на"
+        " предыдущую страницу."
+    )
+
+
+@pytest.mark.django_db
+def test_cursor_pagination_rejects_bad_cursor(client):
+    response = client.get("/", {"cursor": "not-a-cursor"})
+    assert response.status_code == HTTPStatus.NOT_FOUND, (
+        "Убедитесь, что некорректный курсор приводит к ошибке 404."
+    )
+
+
+def count_queries_with_count(client, url):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    return sum("COUNT(*)" in query["sql"] for query in ctx.captured_queries)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_feed_page_count_is_cached(
+        user_client, mixer, user, published_category,
+        many_posts_with_published_locations):
+    cache.clear()
+    url = f"/category/{published_category.slug}/"
+    assert count_queries_with_count(user_client, url) == 1
+    assert count_queries_with_count(user_client, url) == 0, (
+        "Убедитесь, что количество постов для постраничного вывода"
+        " кэшируется."
+    )
+    num_pages = user_client.get(url).context["paginator"].num_pages
+    mixer.cycle(N_PER_PAGE).blend(
+        "blog.Post", author=user, category=published_category,
+        pub_date=many_posts_with_published_locations[0].pub_date)
+    assert count_queries_with_count(user_client, url) == 1, (
+        "Убедитесь, что кэш количества постов сбрасывается при добавлении"
+        " поста."
+    )
+    assert user_client.get(url).context["paginator"].num_pages == num_pages + 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_paginator_renders_page_window(
+        client, mixer, user, published_category):
+    mixer.cycle(N_PER_PAGE * 30).blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True)
+    response = client.get("/", {"page": 15})
+    page_obj = response.context["page_obj"]
+    assert list(page_obj.page_window) == list(range(10, 21)), (
+        "Убедитесь, что в постраничной навигации выводятся только соседние"
+        " страницы."
+    )
+    content = response.content.decode()
+    assert "?page=21\"" not in content and "?page=9\"" not in content
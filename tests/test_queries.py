@@ -0,0 +1,197 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.utils import timezone
+from django.test.utils import CaptureQueriesContext
+
+from conftest import N_PER_PAGE
+
+
+def count_page_queries(client, url):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK, (
+        f"Убедитесь, что страница `{url}` загружается без ошибок."
+    )
+    return len(ctx.captured_queries)
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize("page", ["index", "category", "profile"])
+def test_feed_query_count_does_not_depend_on_page_size(
+        page, mixer, user, user_client, published_category,
+        published_locations):
+    urls = {
+        "index": "/",
+        "category": f"/category/{published_category.slug}/",
+        "profile": f"/profile/{user.username}/",
+    }
+
+    def blend_posts(n):
+        posts = mixer.cycle(n).blend(
+            "blog.Post",
+            author=user,
+            category=published_category,
+            location=mixer.sequence(*published_locations),
+        )
+        for post in posts:
+            mixer.cycle(2).blend("blog.Comment", post=post)
+
+    blend_posts(1)
+    n_queries_one_post = count_page_queries(user_client, urls[page])
+    blend_posts(N_PER_PAGE * 2)
+    n_queries_full_page = count_page_queries(user_client, urls[page])
+    assert n_queries_one_post == n_queries_full_page, (
+        "Убедитесь, что количество запросов к базе данных на странице ленты"
+        " не зависит от количества постов на странице."
+    )
+
+
+@pytest.mark.skipif(
+    connection.vendor != "sqlite", reason="Планы запросов SQLite")
+@pytest.mark.django_db
+def test_feed_queries_use_indexes(user, published_category):
+    from blog.models import Comment, Post
+
+    now = timezone.now()
+    plans = {
+        "post_published_feed_idx": Post.objects.filter(
+            is_published=True, pub_date__lt=now
+        ).order_by("-pub_date"),
+        "post_category_feed_idx": Post.objects.filter(
+            is_published=True, pub_date__lt=now,
+            category=published_category,
+        ).order_by("-pub_date"),
+        "post_author_feed_idx": Post.objects.filter(
+            author=user).order_by("-pub_date"),
+        "comment_post_created_idx": Comment.objects.filter(
+            post_id=1).order_by("created_at"),
+    }
+    for index_name, qs in plans.items():
+        plan = qs.explain()
+        assert index_name in plan, (
+            f"Убедитесь, что для запроса используется индекс `{index_name}`."
+            f" План запроса:\n{plan}"
+        )
+        assert "TEMP B-TREE" not in plan, (
+            "Убедитесь, что для сортировки ленты не требуется отдельная"
+            f" сортировка. План запроса:\n{plan}"
+        )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_post_detail_loads_post_once(
+        user_client, another_user_client, post_with_published_location):
+    url = f"/posts/{post_with_published_location.id}/"
+    for client in (user_client, another_user_client):
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        post_queries = [
+            query["sql"] for query in ctx.captured_queries
+            if 'FROM "blog_post"' in query["sql"]
+            or 'FROM "blog_category"' in query["sql"]
+            or 'FROM "blog_location"' in query["sql"]
+        ]
+        assert len(post_queries) == 1, (
+            "Убедитесь, что на странице поста публикация вместе с автором,"
+            " категорией и местоположением загружается одним запросом."
+        )
+        assert len(ctx.captured_queries) <= 4, (
+            "Убедитесь, что страница поста не выполняет лишних запросов к"
+            " базе данных."
+        )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_post_detail_comments_query_count(
+        mixer, user_client, post_with_published_location):
+    url = f"/posts/{post_with_published_location.id}/"
+    mixer.blend("blog.Comment", post=post_with_published_location)
+    n_queries_one_comment = count_page_queries(user_client, url)
+    mixer.cycle(N_PER_PAGE).blend(
+        "blog.Comment", post=post_with_published_location)
+    assert count_page_queries(user_client, url) == n_queries_one_comment, (
+        "Убедитесь, что авторы комментариев на странице поста загружаются"
+        " вместе с комментариями."
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_post_detail_comments_window(
+        monkeypatch, mixer, user_client, post_with_published_location):
+    import blog.constants as const
+
+    monkeypatch.setattr(const, "COMMENTS_AT_PAGE", 3)
+    url = f"/posts/{post_with_published_location.id}/"
+    comments = mixer.cycle(7).blend(
+        "blog.Comment", post=post_with_published_location)
+    seen_ids = []
+    cursor = ""
+    while True:
+        response = user_client.get(url, {"comments_cursor": cursor})
+        assert response.status_code == HTTPStatus.OK
+        window = response.context["comments"]
+        assert len(window) <= 3
+        seen_ids.extend(comment.id for comment in window)
+        if not window.has_next():
+            break
+        cursor = window.next_cursor
+    assert seen_ids == [comment.id for comment in comments], (
+        "Убедитесь, что комментарии на странице поста выводятся порциями"
+        " по порядку, без пропусков и повторов."
+    )
+
+
+def text_queries(ctx, table):
+    return [
+        query["sql"] for query in ctx.captured_queries
+        if query["sql"].startswith("SELECT")
+        and f'"{table}"."text"' in query["sql"]
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_write_views_do_not_read_text(
+        user_client, mixer, user, post_with_published_location):
+    post = post_with_published_location
+    with CaptureQueriesContext(connection) as ctx:
+        user_client.post(
+            f"/posts/{post.id}/comment/", {"text": "New comment"})
+    assert not text_queries(ctx, "blog_post"), (
+        "Убедитесь, что при добавлении комментария текст публикации не"
+        " загружается из базы данных."
+    )
+    comment = mixer.blend("blog.Comment", post=post, author=user)
+    with CaptureQueriesContext(connection) as ctx:
+        user_client.post(f"/posts/{post.id}/delete_comment/{comment.id}/")
+    assert not text_queries(ctx, "blog_comment"), (
+        "Убедитесь, что при удалении комментария его текст не загружается"
+        " из базы данных."
+    )
+    with CaptureQueriesContext(connection) as ctx:
+        user_client.post(f"/posts/{post.id}/delete/")
+    assert not text_queries(ctx, "blog_post"), (
+        "Убедитесь, что при удалении публикации её текст не загружается"
+        " из базы данных."
+    )
+    assert not type(post).objects.filter(pk=post.id).exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_post_with_many_comments_is_deleted_in_bulk(
+        user_client, mixer, user, post_with_published_location,
+        CommentModel):
+    post = post_with_published_location
+    CommentModel.objects.bulk_create(
+        CommentModel(post=post, author=user, text=f"Комментарий {number}")
+        for number in range(200))
+    with CaptureQueriesContext(connection) as ctx:
+        response = user_client.post(f"/posts/{post.id}/delete/")
+    assert response.status_code == HTTPStatus.FOUND
+    assert len(ctx.captured_queries) <= 12, (
+        "Убедитесь, что комментарии удаляемой публикации удаляются одним"
+        " запросом, а не по одному."
+    )
+    assert not CommentModel.objects.filter(post_id=post.id).exists()
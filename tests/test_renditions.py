@@ -0,0 +1,100 @@
+from io import BytesIO, StringIO
+
+import pytest
+from PIL import Image
+from django.core.cache import cache
+from django.core.files.images import ImageFile
+from django.core.management import call_command
+
+from blog.renditions import get_rendition_name
+from core.models import Job
+import blog.constants as const
+
+
+@pytest.fixture
+def post_with_large_image(mixer, user, published_location, published_category):
+    img = Image.new("RGB", (3000, 1500), color=(73, 109, 137))
+    img_io = BytesIO()
+    img.save(img_io, format="JPEG")
+    return mixer.blend(
+        "blog.Post",
+        location=published_location,
+        category=published_category,
+        author=user,
+        is_published=True,
+        image=ImageFile(img_io, name="large_image.jpg"),
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_renditions_are_generated_on_upload(post_with_large_image):
+    image = post_with_large_image.image
+    assert not image.storage.exists(
+        get_rendition_name(image.name, "full")), (
+        "Убедитесь, что уменьшенные копии картинки создаются в фоновой"
+        " задаче, а не при обработке запроса."
+    )
+    call_command("run_jobs", "--once", "--processes", "0", stdout=StringIO())
+    for rendition, max_size in const.IMAGE_RENDITIONS.items():
+        name = get_rendition_name(image.name, rendition)
+        assert image.storage.exists(name), (
+            "Убедитесь, что при загрузке картинки создаются её уменьшенные"
+            f" копии (`{rendition}`)."
+        )
+        with image.storage.open(name) as f, Image.open(f) as rendered:
+            assert rendered.width <= max_size[0]
+            assert rendered.height <= max_size[1]
+            assert rendered.width / rendered.height == pytest.approx(2, 0.01)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_feed_card_uses_rendition(user_client, post_with_large_image):
+    image = post_with_large_image.image
+    feed_name = get_rendition_name(image.name, "feed")
+    call_command("run_jobs", "--once", "--processes", "0", stdout=StringIO())
+    content = user_client.get("/").content.decode()
+    assert image.storage.url(feed_name) in content, (
+        "Убедитесь, что в ленте выводится уменьшенная копия картинки."
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_missing_rendition_is_queued_not_rendered(
+        user_client, post_with_large_image):
+    image = post_with_large_image.image
+    feed_name = get_rendition_name(image.name, "feed")
+    # Задача на копии потерялась, а отметка о ней в кэше истекла.
+    Job.objects.all().delete()
+    cache.clear()
+    content = user_client.get("/").content.decode()
+    assert image.url in content, (
+        "Убедитесь, что пока уменьшенной копии нет, выводится оригинал"
+        " картинки."
+    )
+    assert not image.storage.exists(feed_name), (
+        "Убедитесь, что уменьшенные копии не создаются при отрисовке"
+        " шаблона."
+    )
+    assert Job.objects.filter(
+        task="blog.renditions.generate_renditions").count() == 1, (
+        "Убедитесь, что для отсутствующей копии ставится одна фоновая"
+        " задача."
+    )
+    call_command("run_jobs", "--once", "--processes", "0", stdout=StringIO())
+    content = user_client.get("/").content.decode()
+    assert image.storage.url(feed_name) in content, (
+        "Убедитесь, что после создания копий карточки в кэше обновляются."
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_make_renditions_skips_decompression_bomb(
+        monkeypatch, post_with_large_image):
+    monkeypatch.setattr(Image, "MAX_IMAGE_PIXELS", 1000)
+    stderr = StringIO()
+    call_command(
+        "make_renditions", "--force", stdout=StringIO(), stderr=stderr)
+    assert post_with_large_image.image.name in stderr.getvalue(), (
+        "Убедитесь, что `make_renditions` пропускает картинки, которые"
+        " Pillow считает бомбой распаковки, и сообщает о них."
+    )
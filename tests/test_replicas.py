@@ -0,0 +1,76 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connections
+
+
+@pytest.fixture
+def replica(db, settings, tmp_path):
+    alias = "replica"
+    connections.settings[alias] = {
+        **connections["default"].settings_dict,
+        "NAME": str(tmp_path / "replica.sqlite3"),
+        "TEST": {},
+    }
+    settings.DATABASE_REPLICAS = [alias]
+    call_command("migrate", database=alias, verbosity=0)
+    yield alias
+    connections[alias].close()
+    del connections.settings[alias]
+    delattr(connections._connections, alias)
+
+
+def test_feed_reads_from_replica(
+        replica, user_client, post_with_published_location):
+    from blog.models import Post
+
+    post = post_with_published_location
+    assert not Post.objects.using(replica).exists()
+    response = user_client.get("/")
+    assert response.status_code == HTTPStatus.OK
+    assert post.title not in response.content.decode("utf-8"), (
+        "Убедитесь, что лента читается с реплики базы данных."
+    )
+    assert user_client.get(f"/posts/{post.id}/").status_code == (
+        HTTPStatus.NOT_FOUND)
+
+
+def test_writer_is_pinned_to_primary(
+        replica, user_client, post_with_published_location):
+    post = post_with_published_location
+    url = f"/posts/{post.id}/"
+    response = user_client.post(f"{url}comment/", {"text": "Комментарий"})
+    assert response.status_code == HTTPStatus.FOUND
+    assert user_client.get(url).status_code == HTTPStatus.OK, (
+        "Убедитесь, что после добавления комментария автор какое-то время"
+        " читает данные с основной базы и видит свои изменения."
+    )
+    del user_client.cookies["primary_pin"]
+    assert user_client.get(url).status_code == HTTPStatus.NOT_FOUND, (
+        "Убедитесь, что закрепление за основной базой временное."
+    )
+
+
+@pytest.mark.parametrize("action", ["edit", "delete_comment", "delete_post"])
+def test_editor_is_pinned_to_primary(
+        action, replica, mixer, user_client, post_with_published_location):
+    post = post_with_published_location
+    if action == "edit":
+        response = user_client.post(f"/posts/{post.id}/edit/", {
+            "title": post.title,
+            "text": post.text,
+            "pub_date": post.pub_date.strftime("%Y-%m-%d %H:%M"),
+            "category": post.category_id,
+        })
+    elif action == "delete_comment":
+        comment = mixer.blend("blog.Comment", post=post, author=post.author)
+        response = user_client.post(
+            f"/posts/{post.id}/delete_comment/{comment.id}/")
+    else:
+        response = user_client.post(f"/posts/{post.id}/delete/")
+    assert response.status_code == HTTPStatus.FOUND
+    assert "primary_pin" in response.cookies, (
+        "Убедитесь, что после изменения или удаления автор закрепляется"
+        " за основной базой данных."
+    )
@@ -0,0 +1,122 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.utils import timezone
+
+pytestmark = [
+    pytest.mark.skipif(
+        connection.vendor != "sqlite", reason="Полнотекстовый поиск SQLite"),
+    pytest.mark.django_db,
+]
+
+
+@pytest.fixture
+def blend_post(mixer, user, published_category):
+    def blend(**kwargs):
+        defaults = {
+            "author": user,
+            "category": published_category,
+            "is_published": True,
+            "pub_date": timezone.now() - timedelta(days=1),
+        }
+        return mixer.blend("blog.Post", **{**defaults, **kwargs})
+    return blend
+
+
+def search(client, query):
+    response = client.get("/search/", {"q": query})
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что страница поиска `/search/` загружается без ошибок."
+    )
+    return response
+
+
+def test_search_ranks_and_highlights(user_client, blend_post):
+    in_text = blend_post(
+        title="Заметки", text="Вчера мы ходили смотреть на тюленей.")
+    in_title = blend_post(title="Тюлени Камчатки", text="Фотографии.")
+    blend_post(title="Про котов", text="Коты спят весь день.")
+    response = search(user_client, "тюлен")
+    found = [post.id for post in response.context["page_obj"]]
+    assert found == [in_title.id, in_text.id], (
+        "Убедитесь, что поиск находит публикации по началу слова и ставит"
+        " выше совпадения в заголовке."
+    )
+    assert "<mark>тюленей</mark>" in response.content.decode("utf-8"), (
+        "Убедитесь, что найденные слова подсвечиваются во фрагменте текста."
+    )
+
+
+def test_search_respects_publication_rules(
+        user_client, blend_post, mixer):
+    unpublished_category = mixer.blend(
+        "blog.Category", is_published=False)
+    blend_post(text="моржи", is_published=False)
+    blend_post(
+        text="моржи", pub_date=timezone.now() + timedelta(days=1))
+    blend_post(text="моржи", category=unpublished_category)
+    visible = blend_post(text="моржи")
+    response = search(user_client, "моржи")
+    assert [post.id for post in response.context["page_obj"]] == [
+        visible.id], (
+        "Убедитесь, что в результатах поиска только опубликованные посты"
+        " из опубликованных категорий с наступившей датой публикации."
+    )
+
+
+def test_search_index_follows_changes(user_client, blend_post):
+    post = blend_post(text="пингвины")
+    post.text = "пеликаны"
+    post.save()
+    assert not search(user_client, "пингвины").context["page_obj"], (
+        "Убедитесь, что поисковый индекс обновляется при изменении поста."
+    )
+    assert search(user_client, "пеликаны").context["page_obj"]
+    post.delete()
+    assert not search(user_client, "пеликаны").context["page_obj"]
+
+
+def test_search_escapes_input_and_text(user_client, blend_post):
+    blend_post(text='<script>alert("x")</script> чайки')
+    content = search(user_client, '"чайки (*').content.decode("utf-8")
+    assert "<mark>чайки</mark>" in content
+    assert "<script>alert" not in content, (
+        "Убедитесь, что текст поста во фрагментах экранируется."
+    )
+
+
+def test_admin_search_uses_index(admin_client, blend_post):
+    post = blend_post(title="Альбатрос")
+    response = admin_client.get(
+        "/admin/blog/post/", {"q": "альбатрос"})
+    assert response.status_code == HTTPStatus.OK
+    assert list(response.context["cl"].result_list) == [post]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_search_index_survives_table_rebuild(user_client, blend_post):
+    from django.core.management import call_command
+
+    from blog.models import Post
+    from blog.search import TRIGGER_NAMES
+
+    field = Post._meta.get_field("title")
+    wider = field.clone()
+    wider.set_attributes_from_name("title")
+    wider.max_length = field.max_length + 1
+    with connection.schema_editor() as schema_editor:
+        schema_editor.alter_field(Post, field, wider)
+        schema_editor.alter_field(Post, wider, field)
+    call_command("migrate", verbosity=0)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger'")
+        triggers = {row[0] for row in cursor.fetchall()}
+    assert set(TRIGGER_NAMES) <= triggers, (
+        "Убедитесь, что после миграций, пересоздающих таблицу постов,"
+        " триггеры поискового индекса восстанавливаются."
+    )
+    blend_post(text="альбатросы")
+    assert search(user_client, "альбатросы").context["page_obj"]
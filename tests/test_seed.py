@@ -0,0 +1,77 @@
+import pytest
+from django.core.management import call_command
+from django.db.models import Count, F
+
+SEED_OPTIONS = dict(
+    users=5, categories=2, locations=3, posts=30, comments=200, seed=7,
+    verbosity=0)
+
+
+def snapshot():
+    from blog.models import Comment, Post
+
+    return (
+        list(Post.objects.order_by("pk").values_list(
+            "pk", "title", "author_id", "category_id", "comment_count")),
+        list(Comment.objects.order_by("pk").values_list(
+            "post_id", "author_id", "text")),
+    )
+
+
+@pytest.mark.django_db
+def test_seed_blog_creates_consistent_data():
+    from django.contrib.auth import get_user_model
+
+    from blog.models import Category, Comment, Location, Post
+
+    call_command("seed_blog", **SEED_OPTIONS)
+    assert get_user_model().objects.count() == 5
+    assert Category.objects.count() == 2
+    assert Location.objects.count() == 3
+    assert Post.objects.count() == 30
+    assert Comment.objects.count() == 200
+    assert not Post.objects.annotate(
+        actual=Count("comment")).exclude(comment_count=F("actual")), (
+        "Убедитесь, что `seed_blog` заполняет счётчики комментариев"
+        " публикаций."
+    )
+
+
+@pytest.mark.django_db
+def test_seed_blog_is_deterministic():
+    from django.contrib.auth import get_user_model
+
+    from blog.models import Category, Location, Post
+
+    call_command("seed_blog", **SEED_OPTIONS)
+    first = snapshot()
+    Post.objects.all().delete()
+    for model in (get_user_model(), Category, Location):
+        model.objects.all().delete()
+    call_command("seed_blog", **SEED_OPTIONS)
+    assert snapshot() == first, (
+        "Убедитесь, что при одинаковом `--seed` команда `seed_blog` создаёт"
+        " одинаковые данные."
+    )
+
+
+@pytest.mark.django_db
+def test_seed_blog_invalidates_feed_caches():
+    from django.core.cache import cache
+
+    from blog.cache import get_version
+    from blog.schedule import NEXT_PUB_DATE_KEY, get_next_pub_date
+
+    get_next_pub_date()
+    names = ("posts", "page:all")
+    versions = {name: get_version(name) for name in names}
+    call_command("seed_blog", **SEED_OPTIONS)
+    for name in names:
+        assert get_version(name) != versions[name], (
+            "Убедитесь, что после `seed_blog` сбрасывается кэш лент и"
+            " количества постов."
+        )
+    assert cache.get(NEXT_PUB_DATE_KEY) is None, (
+        "Убедитесь, что после `seed_blog` сбрасывается дата следующей"
+        " отложенной публикации."
+    )
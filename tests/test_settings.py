@@ -0,0 +1,59 @@
+import importlib
+import sys
+
+import pytest
+
+PROD_MIDDLEWARE = [
+    "core.middleware.InstrumentationMiddleware",
+    "django.middleware.security.SecurityMiddleware",
+    "django.contrib.sessions.middleware.SessionMiddleware",
+    "django.middleware.common.CommonMiddleware",
+    "django.middleware.csrf.CsrfViewMiddleware",
+    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "core.middleware.ReplicaRoutingMiddleware",
+    "django.contrib.messages.middleware.MessageMiddleware",
+    "django.middleware.clickjacking.XFrameOptionsMiddleware",
+]
+
+
+def test_prod_middleware_stack(prod_settings):
+    assert prod_settings.MIDDLEWARE == PROD_MIDDLEWARE, (
+        "Убедитесь, что в боевых настройках нет отладочных промежуточных"
+        " обработчиков."
+    )
+    assert "debug_toolbar" not in prod_settings.INSTALLED_APPS
+    assert not prod_settings.DEBUG
+
+
+def test_prod_settings_for_performance(prod_settings):
+    assert prod_settings.DATABASES["default"]["CONN_MAX_AGE"] > 0, (
+        "Убедитесь, что в боевых настройках соединения с базой данных"
+        " переиспользуются."
+    )
+    assert "filebased" in prod_settings.CACHES["default"]["BACKEND"]
+    assert prod_settings.STATICFILES_STORAGE == (
+        "core.storage.CompressedManifestStaticFilesStorage")
+
+
+def test_prod_settings_require_secret_key(monkeypatch):
+    monkeypatch.delenv("DJANGO_SECRET_KEY", raising=False)
+    sys.modules.pop("blogicum.settings.prod", None)
+    with pytest.raises(KeyError):
+        importlib.import_module("blogicum.settings.prod")
+
+
+@pytest.mark.parametrize("backend, expected", [
+    ("locmem", "LocMemCache"),
+    ("file", "FileBasedCache"),
+    ("db", "DatabaseCache"),
+])
+def test_cache_backend_is_configurable(
+        monkeypatch, prod_settings, backend, expected):
+    monkeypatch.setenv("BLOGICUM_CACHE", backend)
+    monkeypatch.setenv("BLOGICUM_CACHE_LOCATION", "/tmp/blogicum-test")
+    caches = prod_settings.build_caches("file")
+    assert caches["default"]["BACKEND"].endswith(expected), (
+        "Убедитесь, что бэкенд кэша выбирается переменной окружения"
+        " `BLOGICUM_CACHE`."
+    )
+    assert caches["default"]["LOCATION"] == "/tmp/blogicum-test"
@@ -0,0 +1,34 @@
+from core.templates import warm_up_templates, warm_up_templates_for_server
+
+
+def test_all_templates_compile(settings):
+    compiled = warm_up_templates()
+    templates_dir = settings.TEMPLATES_DIR
+    expected = {
+        path.relative_to(templates_dir).as_posix()
+        for path in templates_dir.rglob("*.html")
+    }
+    assert expected <= set(compiled), (
+        "Убедитесь, что при прогреве компилируются все шаблоны проекта."
+    )
+
+
+def test_prod_settings_use_cached_loader(prod_settings):
+    template_settings = prod_settings.TEMPLATES[0]
+    loaders = template_settings["OPTIONS"]["loaders"]
+    assert not template_settings["APP_DIRS"]
+    assert loaders[0][0] == "django.template.loaders.cached.Loader", (
+        "Убедитесь, что в боевых настройках шаблоны загружаются через"
+        " кэширующий загрузчик."
+    )
+    assert prod_settings.WARM_UP_TEMPLATES
+
+
+def test_templates_are_warmed_up_only_for_server(settings):
+    settings.WARM_UP_TEMPLATES = False
+    assert warm_up_templates_for_server() == []
+    settings.WARM_UP_TEMPLATES = True
+    assert warm_up_templates_for_server(), (
+        "Убедитесь, что при включённом WARM_UP_TEMPLATES шаблоны"
+        " компилируются при запуске веб-сервера."
+    )
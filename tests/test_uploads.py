@@ -0,0 +1,96 @@
+import struct
+import zlib
+from http import HTTPStatus
+from io import BytesIO
+
+import pytest
+from PIL import Image
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client
+from django.utils import timezone
+
+
+def png_header(width, height):
+    def chunk(kind, data):
+        return (
+            struct.pack(">I", len(data)) + kind + data
+            + struct.pack(">I", zlib.crc32(kind + data)))
+
+    ihdr = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", ihdr)
+        + chunk(b"IDAT", zlib.compress(b"\x00" * 64)) + chunk(b"IEND", b""))
+
+
+def jpeg_bytes(size=(100, 100)):
+    img_io = BytesIO()
+    Image.new("RGB", size, color=(73, 109, 137)).save(img_io, format="JPEG")
+    return img_io.getvalue()
+
+
+def post_image(user_client, published_category, content):
+    return user_client.post("/posts/create/", {
+        "title": "Post with image",
+        "text": "Text",
+        "pub_date": timezone.now().strftime("%Y-%m-%d %H:%M"),
+        "category": published_category.id,
+        "image": SimpleUploadedFile("image.png", content),
+    })
+
+
+@pytest.mark.django_db(transaction=True)
+def test_decompression_bomb_is_rejected(
+        user_client, published_category, PostModel):
+    response = post_image(
+        user_client, published_category, png_header(30000, 30000))
+    assert response.status_code == HTTPStatus.OK
+    assert "image" in response.context["form"].errors, (
+        "Убедитесь, что картинка со слишком большим разрешением не"
+        " принимается формой публикации."
+    )
+    assert not PostModel.objects.exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_oversized_upload_is_rejected(
+        monkeypatch, user_client, published_category, PostModel):
+    import blog.constants as const
+
+    monkeypatch.setattr(const, "MAX_IMAGE_UPLOAD_SIZE", 100)
+    response = post_image(user_client, published_category, jpeg_bytes())
+    assert response.status_code == HTTPStatus.OK
+    assert "image" in response.context["form"].errors, (
+        "Убедитесь, что слишком большой файл картинки не принимается формой"
+        " публикации."
+    )
+    assert not PostModel.objects.exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_valid_upload_is_streamed_to_disk(
+        caplog, user_client, published_category, PostModel):
+    caplog.set_level("INFO", logger="blog.uploads")
+    response = post_image(user_client, published_category, jpeg_bytes())
+    assert response.status_code == HTTPStatus.FOUND
+    assert PostModel.objects.get().image
+    metrics = [
+        record.args[1] for record in caplog.records
+        if record.name == "blog.uploads"]
+    assert metrics and metrics[0]["bytes"], (
+        "Убедитесь, что для загрузки картинки записываются метрики."
+    )
+    assert set(metrics[0]) >= {"bytes", "chunks", "seconds", "peak_rss"}, (
+        "Убедитесь, что для загрузки записываются размер, число частей,"
+        " время и пиковый RSS процесса."
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_image_upload_view_keeps_csrf_protection(user, published_category):
+    client = Client(enforce_csrf_checks=True)
+    client.force_login(user)
+    response = post_image(client, published_category, jpeg_bytes())
+    assert response.status_code == HTTPStatus.FORBIDDEN, (
+        "Убедитесь, что форма публикации с картинкой по-прежнему"
+        " проверяет CSRF-токен."
+    )